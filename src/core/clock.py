@@ -5,14 +5,19 @@ from dataclasses import dataclass
 from typing import Callable
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeProvider:
     now_fn: Callable[[], float] = time.time
     sleep_fn: Callable[[float], None] = time.sleep
+    # Elapsed-time source for cooldowns and timeouts; immune to wall-clock steps (NTP, manual changes)
+    monotonic_fn: Callable[[], float] = time.monotonic
 
     def now(self) -> float:
         return float(self.now_fn())
 
+    def monotonic(self) -> float:
+        return float(self.monotonic_fn())
+
     def sleep(self, seconds: float) -> None:
         self.sleep_fn(seconds)
 
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import inspect
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from decimal import Decimal
 from typing import Any, Dict
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Credentials:
     account_address: str
     secret_key: str
@@ -19,79 +22,86 @@ class Credentials:
             # Lazy imports to keep core decoupled when not needed
             from hyperliquid.info import Info  # type: ignore
             from hyperliquid.exchange import Exchange  # type: ignore
-        except Exception:
+            from hyperliquid.utils.error import Error as SDKError  # type: ignore
+        except ImportError:
             return None, None, None
 
-        # Construct signing wallet
-        wallet_obj = None
-        try:
-            from eth_account import Account  # type: ignore
-
-            wallet_obj = Account.from_key(self.secret_key)
-        except Exception:
-            try:
-                from hyperliquid.utils.signing import LocalAccount  # type: ignore
-
-                wallet_obj = LocalAccount.from_key(self.secret_key)
-            except Exception:
-                wallet_obj = None
-
-        # Info construction (compatible with multiple SDK versions)
-        info = None
+        # Construct signing wallet; only a malformed key can fail here
+        wallet_cls = _wallet_factory()
+        if wallet_cls is None:
+            return None, None, None
         try:
-            info = Info(self.base_url)
-        except Exception:
-            try:
-                info = Info(base_url=self.base_url)
-            except Exception:
-                info = None
-
-        if wallet_obj is None or info is None:
+            wallet_obj = wallet_cls.from_key(self.secret_key)
+        except (ValueError, TypeError):
             return None, None, None
 
-        # Exchange construction across versions (must include wallet to enable signing)
-        exchange = None
-        ctor_list = (
-            lambda: Exchange(wallet_obj, info, self.base_url),
-            lambda: Exchange(wallet_obj, info),
-            lambda: Exchange(wallet_obj, self.base_url),
-            lambda: Exchange(info, wallet_obj, self.base_url),
-            lambda: Exchange(info, wallet_obj),
-            lambda: Exchange(self.base_url, wallet_obj),
-        )
-        def _has_sign(obj: Any) -> bool:
-            try:
-                return callable(getattr(obj, "sign_message", None))
-            except Exception:
-                return False
-        # Try constructors and force-bind wallet with signing capability
-        for ctor in ctor_list:
-            try:
-                ex = ctor()
-                # Force-correct wallet attribute if SDK stored a string
-                try:
-                    if not _has_sign(getattr(ex, "wallet", None)):
-                        setattr(ex, "wallet", wallet_obj)
-                except Exception:
-                    pass
-                exchange = ex
-                break
-            except Exception:
-                continue
-
-        if exchange is None:
+        # SDK constructors are matched by parameter name, so one call covers every supported layout.
+        # Construction itself talks to the API (meta fetch, websocket): transport errors subclass OSError,
+        # API errors the SDK Error, and a bad payload surfaces as ValueError/KeyError/TypeError.
+        candidates = {"base_url": self.base_url, "wallet": wallet_obj}
+        try:
+            info = Info(**_ctor_kwargs(Info, candidates))
+            exchange = Exchange(**_ctor_kwargs(Exchange, {**candidates, "info": info}))
+        except (OSError, ValueError, KeyError, TypeError, SDKError):
             return None, None, None
+        _share_http_session(info, exchange, getattr(exchange, "info", None))
+        # Force-correct wallet attribute if SDK stored something without signing capability
+        if not callable(getattr(getattr(exchange, "wallet", None), "sign_message", None)):
+            setattr(exchange, "wallet", wallet_obj)
 
         # Derive address
-        addr = None
-        try:
-            addr = str(wallet_obj.address)
-        except Exception:
-            addr = None
-        return info, exchange, addr
-
-
-@dataclass
+        addr = getattr(wallet_obj, "address", None)
+        return info, exchange, (str(addr) if addr is not None else None)
+
+
+def _wallet_factory() -> Any:
+    # First available class exposing from_key(): eth_account.Account, else the SDK re-export
+    try:
+        from eth_account import Account  # type: ignore
+    except ImportError:
+        Account = None  # type: ignore
+    if hasattr(Account, "from_key"):
+        return Account
+    try:
+        from hyperliquid.utils.signing import LocalAccount  # type: ignore
+    except ImportError:
+        return None
+    return LocalAccount if hasattr(LocalAccount, "from_key") else None
+
+
+def _share_http_session(*clients: Any) -> None:
+    # Info, Exchange and the Exchange's own Info each open a requests.Session to the same API host. Give them one
+    # keep-alive pool sized for the runner's concurrent reads, so a connection warmed by one client serves the others
+    # instead of each paying its own TCP/TLS handshake. max_retries=0: order posts must never be replayed silently.
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for client in clients:
+        old = getattr(client, "session", None)
+        if isinstance(old, requests.Session) and old is not session:
+            session.headers.update(old.headers)
+            client.session = session
+            old.close()
+
+
+@lru_cache(maxsize=None)
+def _ctor_params(cls: type) -> frozenset:
+    return frozenset(inspect.signature(cls.__init__).parameters)
+
+
+def _ctor_kwargs(cls: type, candidates: Dict[str, Any]) -> Dict[str, Any]:
+    # Keyword arguments the constructor actually accepts, picked from the candidates by name
+    params = _ctor_params(cls)
+    return {k: v for k, v in candidates.items() if k in params}
+
+
+@dataclass(frozen=True, slots=True)
 class StrategyParams:
     enter_threshold_apr: Decimal
     exit_threshold_apr: Decimal
@@ -99,7 +109,7 @@ class StrategyParams:
     hedge_ratio: Decimal
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionParams:
     price_offset_ticks: int
     tif: str
@@ -116,7 +126,7 @@ class ExecutionParams:
     enter_exit_cooldown_s: int | None = 300
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RiskParams:
     per_symbol_notional_cap: Decimal
     portfolio_notional_cap: Decimal
@@ -124,7 +134,7 @@ class RiskParams:
     min_spread_ticks: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TelemetryParams:
     log_level: str = "INFO"
     metrics: bool = True
@@ -135,10 +145,11 @@ class TelemetryParams:
     disable_console_logging: bool | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     credentials: Credentials
-    markets: Dict[str, str]
+    # Compared by __eq__ but left out of __hash__ (a dict is unhashable); equal configs still hash equal
+    markets: Dict[str, str] = field(hash=False)
     strategy: StrategyParams
     execution: ExecutionParams
     risk: RiskParams
@@ -147,14 +158,14 @@ class AppConfig:
     alignment: "AlignmentParams"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FeesParams:
     # Decimal rates, e.g. 0.0007 = 0.07%
     spot_maker: Decimal
     spot_taker: Decimal
     perp_maker: Decimal
     perp_taker: Decimal
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AlignmentParams:
     # Enable periodic state alignment with venue data
     enabled: bool = True
@@ -162,6 +173,8 @@ class AlignmentParams:
     mode: str = "log"
     # Only align if absolute difference exceeds this many minimum quantums
     min_diff_quanta: int = 1
+    # Minimum seconds between alignment passes (each pass queries positions and balances)
+    interval_s: float = 30.0
 
 
 def _to_decimal(value: Any) -> Decimal:
@@ -169,6 +182,13 @@ def _to_decimal(value: Any) -> Decimal:
 
 
 def load_config(path: str) -> AppConfig:
+    # Parsed configs are immutable, so identical file contents (same mtime and size) share one instance
+    st = os.stat(path)
+    return _load_config_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, _mtime_ns: int, _size: int) -> AppConfig:
     with open(path, "r", encoding="utf-8") as f:
         raw = json.load(f)
     # Backward-compat: allow legacy flat config
@@ -241,6 +261,7 @@ def load_config(path: str) -> AppConfig:
             enabled=bool(raw.get("alignment", {}).get("enabled", True)),
             mode=str(raw.get("alignment", {}).get("mode", "log")),
             min_diff_quanta=int(raw.get("alignment", {}).get("min_diff_quanta", 1)),
+            interval_s=float(raw.get("alignment", {}).get("interval_s", 30.0)),
         ),
     )
     _validate(app)
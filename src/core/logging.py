@@ -3,9 +3,14 @@ from __future__ import annotations
 import json
 import logging
 from dataclasses import dataclass
-from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+# One formatter and console handler shared by every JsonLogger instead of one pair per logger name
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_SHARED_HANDLER = logging.StreamHandler()
+_SHARED_HANDLER.setFormatter(_FORMATTER)
 
 
 @dataclass
@@ -17,17 +22,12 @@ class JsonLogger:
         self._logger = logging.getLogger(self.name)
         self._logger.setLevel(self.level)
         if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-            self._logger.addHandler(handler)
+            self._logger.addHandler(_SHARED_HANDLER)
         else:
             # Ensure existing stream handlers use consistent formatter
-            try:
-                for h in list(self._logger.handlers):
-                    if isinstance(h, logging.StreamHandler):
-                        h.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-            except Exception:
-                pass
+            for h in self._logger.handlers:
+                if isinstance(h, logging.StreamHandler):
+                    h.setFormatter(_FORMATTER)
         # Prevent duplicate logs via root logger
         self._logger.propagate = False
 
@@ -45,13 +45,16 @@ class JsonLogger:
             return str(value)
         if isinstance(value, (dict, list, tuple)):
             try:
-                return json.dumps(value, ensure_ascii=False, separators=(",", ":"), cls=self._EnhancedJSONEncoder)
+                return _ENCODER.encode(value)
             except Exception:
                 return str(value)
         return str(value)
 
     def log(self, level: int, message: str, **fields: Any) -> None:
-        # Plain key=value fields appended to message; timestamp and level come from formatter
+        # Plain key=value fields appended to message; timestamp and level come from formatter.
+        # Records the level filters out are dropped before any field is formatted.
+        if not self._logger.isEnabledFor(level):
+            return
         try:
             if fields:
                 extras = " ".join(f"{k}={self._format_value(v)}" for k, v in fields.items())
@@ -62,6 +65,25 @@ class JsonLogger:
             line = message
         self._logger.log(level, line)
 
+    def make_emitter(self, message: str, keys: Sequence[str], level: int = logging.INFO) -> Callable[..., None]:
+        # Pre-keyed variant of log() for fixed-schema records emitted in loops:
+        # values are passed positionally in the order of `keys`
+        prefixes = tuple(f" {k}=" for k in keys)
+        fmt = self._format_value
+        logger = self._logger
+
+        def emit(*values: Any) -> None:
+            if not logger.isEnabledFor(level):
+                return
+            # Same fallback as log(): a value whose formatting raises costs the fields, never the caller
+            try:
+                line = message + "".join(p + fmt(v) for p, v in zip(prefixes, values))
+            except Exception:
+                line = message
+            logger.log(level, line)
+
+        return emit
+
     def info(self, message: str, **fields: Any) -> None:
         self.log(logging.INFO, message, **fields)
 
@@ -72,3 +94,7 @@ class JsonLogger:
         self.log(logging.ERROR, message, **fields)
 
 
+# Encoders hold only their settings, so one shared instance serves every record (json.dumps(cls=...) builds one per call)
+_ENCODER = JsonLogger._EnhancedJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
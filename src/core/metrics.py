@@ -5,10 +5,12 @@ from dataclasses import dataclass, field
 from typing import Dict
 
 
-@dataclass
+# Counter/Gauge may be updated from worker threads (adapter/websocket callbacks, executor pools):
+# `_value += n` is a read-modify-write, so every update and read goes through the instance lock.
+@dataclass(slots=True)
 class Counter:
     _value: int = 0
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def inc(self, n: int = 1) -> None:
         with self._lock:
@@ -20,10 +22,10 @@ class Counter:
             return self._value
 
 
-@dataclass
+@dataclass(slots=True)
 class Gauge:
     _value: float = 0.0
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def set(self, v: float) -> None:
         with self._lock:
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+# Decimal is immutable, so hot paths share these instead of constructing them per call
+ZERO = Decimal(0)
+TWO = Decimal(2)
+
+
+@lru_cache(maxsize=8192)
+def dec_from_str(s: str) -> Decimal:
+    # Decimal is immutable, so one instance per distinct venue string is shared; book prices repeat tick to tick
+    return Decimal(s)
+
+
+def to_dec(x: Any) -> Decimal:
+    # Decimal passes through; anything else goes via str (keeps a float's repr value) and the parse cache
+    if isinstance(x, Decimal):
+        return x
+    return dec_from_str(x if isinstance(x, str) else str(x))
+
+
+@lru_cache(maxsize=None)
+def size_quantum(size_decimals: int) -> Decimal:
+    # One lot (10**-size_decimals); venues use a handful of size_decimals values, so each is built once
+    return Decimal(1).scaleb(-size_decimals)
+
+
+def quantize_size(qty: Decimal, size_decimals: int) -> Decimal:
+    # Floor to whole lots; exact in Decimal, so a size never rounds up past the intended notional
+    quantum = size_quantum(size_decimals)
+    return (qty // quantum) * quantum
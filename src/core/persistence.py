@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     ts: float
     kind: str
@@ -18,8 +19,15 @@ class Event:
 class StateStore:
     def __init__(self, db_path: str) -> None:
         self.path = Path(db_path)
-        self._conn = sqlite3.connect(self.path)
+        # Autocommit connection: standalone writes commit themselves, transaction() issues BEGIN/COMMIT explicitly
+        self._conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=256)
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps NORMAL durable across crashes (only power loss can drop the last commits)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        # Sort/index scratch space stays in RAM instead of temp files
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._tx_depth = 0
         self._setup()
 
     class _EnhancedJSONEncoder(json.JSONEncoder):
@@ -34,7 +42,7 @@ class StateStore:
 
     @staticmethod
     def _dumps_safe(obj: Any) -> str:
-        return json.dumps(obj, ensure_ascii=False, cls=StateStore._EnhancedJSONEncoder)
+        return _ENCODER.encode(obj)
 
     def _setup(self) -> None:
         c = self._conn.cursor()
@@ -56,12 +64,26 @@ class StateStore:
             )
             """
         )
-        self._conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Nestable; only the outermost block opens and ends the SQLite transaction
+        outer = self._tx_depth == 0
+        if outer:
+            self._conn.execute("BEGIN")
+        self._tx_depth += 1
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._tx_depth -= 1
+            if outer:
+                self._conn.execute("COMMIT" if ok else "ROLLBACK")
 
     def put(self, key: str, value: Dict[str, Any]) -> None:
         payload = self._dumps_safe(value)
         self._conn.execute("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", (key, payload))
-        self._conn.commit()
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         cur = self._conn.execute("SELECT v FROM kv WHERE k = ?", (key,))
@@ -73,17 +95,26 @@ class StateStore:
     def append_event(self, event: Event) -> None:
         payload = self._dumps_safe(event.data)
         self._conn.execute("INSERT INTO events (ts, kind, data) VALUES (?, ?, ?)", (event.ts, event.kind, payload))
-        self._conn.commit()
+
+    def append_events(self, events: Iterable[Event]) -> None:
+        # Whole batch in one executemany inside a single transaction; rows are encoded before BEGIN
+        rows = [(e.ts, e.kind, self._dumps_safe(e.data)) for e in events]
+        if not rows:
+            return
+        with self.transaction():
+            self._conn.executemany("INSERT INTO events (ts, kind, data) VALUES (?, ?, ?)", rows)
 
     def iter_events(self, kind: Optional[str] = None) -> Iterable[Event]:
         if kind is None:
             cur = self._conn.execute("SELECT ts, kind, data FROM events ORDER BY id ASC")
         else:
             cur = self._conn.execute("SELECT ts, kind, data FROM events WHERE kind = ? ORDER BY id ASC", (kind,))
-        for ts, k, data in cur.fetchall():
+        for ts, k, data in cur:
             yield Event(ts=ts, kind=k, data=json.loads(data))
 
     def close(self) -> None:
         self._conn.close()
 
 
+# Shared encoder instance: same output as json.dumps(obj, ensure_ascii=False, cls=...) without a new encoder per row
+_ENCODER = StateStore._EnhancedJSONEncoder(ensure_ascii=False)
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Market:
     symbol: str
     venue: str
@@ -16,14 +16,14 @@ class Market:
     min_notional: Optional[Decimal] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Quote:
     bid: Decimal
     ask: Decimal
     ts: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Funding:
     symbol: str
     next_rate: Decimal
@@ -32,7 +32,7 @@ class Funding:
     window_seconds: int = 3600
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     oid: Optional[int]
     symbol: str
@@ -44,7 +44,7 @@ class Order:
     status: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     base: Decimal
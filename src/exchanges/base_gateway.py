@@ -3,10 +3,12 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from src.core.num import ZERO, to_dec
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SymbolMeta:
     symbol: str
     venue: str
@@ -17,13 +19,34 @@ class SymbolMeta:
     min_notional: Optional[Decimal] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class OrderSpec:
+    # One limit order for place_orders(); same fields as place_order()'s arguments
+    symbol: str
+    side: str
+    qty: Decimal
+    price: Decimal
+    tif: str = "Gtc"
+    reduce_only: bool = False
+    post_only: bool = False
+
+
+@dataclass(frozen=True, slots=True)
 class Quote:
     bid: Decimal
     ask: Decimal
     ts: float
 
 
+def top_of_book(l2: Dict[str, Any]) -> Tuple[Decimal, Decimal]:
+    # Best bid/ask px of an L2 snapshot {"levels": [bids, asks]}; a missing or empty side reads as 0.
+    # The one parser behind every gateway, strategy and runner best-bid/ask helper.
+    levels = l2.get("levels") or ()
+    bids = levels[0] if len(levels) > 0 else ()
+    asks = levels[1] if len(levels) > 1 else ()
+    return (to_dec(bids[0]["px"]) if bids else ZERO), (to_dec(asks[0]["px"]) if asks else ZERO)
+
+
 class ExchangeGateway(ABC):
     @abstractmethod
     def normalize_symbol(self, raw_symbol: str) -> str:
@@ -70,4 +93,17 @@ class ExchangeGateway(ABC):
     def cancel_order(self, symbol: str, oid: int) -> Any:
         raise NotImplementedError
 
-
+    def prepare_symbol(self, symbol: str) -> None:
+        # One-time per-symbol setup before the first order (e.g. perp leverage). No-op by default; callers that
+        # send this venue's order through another gateway's batch call it first.
+        return None
+
+    def place_orders(self, orders: Sequence[OrderSpec]) -> List[Any]:
+        # One response per spec, in order. Default is one place_order() each; venues with a batch endpoint
+        # override this to submit every spec in a single request.
+        return [
+            self.place_order(
+                o.symbol, o.side, o.qty, o.price, tif=o.tif, reduce_only=o.reduce_only, post_only=o.post_only
+            )
+            for o in orders
+        ]
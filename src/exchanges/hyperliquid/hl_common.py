@@ -2,15 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-try:  # Allow tests to run without the SDK installed
+from src.core.num import to_dec
+from src.exchanges.base_gateway import OrderSpec, top_of_book
+
+if TYPE_CHECKING:  # annotations only; the SDK import is slow and the info object is passed in by the caller
     from hyperliquid.info import Info  # type: ignore
-except Exception:  # pragma: no cover - fallback for environments without SDK
-    Info = Any  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class HLClients:
     address: str
     info: Info
@@ -24,26 +25,53 @@ def infer_tick_from_l2(info: Info, symbol: str) -> Optional[Decimal]:
         levels = l2.get("levels") or []
         bids = levels[0] if len(levels) > 0 else []
         asks = levels[1] if len(levels) > 1 else []
-        pxs = []
-        for side in (bids[:10], asks[:10]):
-            pxs.extend([Decimal(str(l["px"])) for l in side])
-        pxs = sorted(set(pxs), reverse=True)
-        diffs = [abs(pxs[i] - pxs[i + 1]) for i in range(len(pxs) - 1)]
-        diffs = [d for d in diffs if d > 0]
-        if diffs:
-            return min(diffs)
+        # one pass over both sides (to_dec's cache makes repeat prices free); the set dedupes,
+        # and sorted ascending, adjacent differences are already positive
+        pxs = sorted({to_dec(l["px"]) for side in (bids[:10], asks[:10]) for l in side})
+        if len(pxs) > 1:
+            return min(b - a for a, b in zip(pxs, pxs[1:]))
     except Exception:
         return None
     return None
 
 
 def best_bid_ask(info: Info, symbol: str) -> Tuple[Decimal, Decimal]:
-    l2 = info.l2_snapshot(symbol)
-    levels = l2.get("levels") or []
-    bids = levels[0] if len(levels) > 0 else []
-    asks = levels[1] if len(levels) > 1 else []
-    best_bid = Decimal(str(bids[0]["px"])) if bids else Decimal("0")
-    best_ask = Decimal(str(asks[0]["px"])) if asks else Decimal("0")
-    return best_bid, best_ask
+    return top_of_book(info.l2_snapshot(symbol))
+
 
+def _order_type(tif: str, post_only: bool) -> Dict[str, Any]:
+    limit: Dict[str, Any] = {"tif": tif}
+    if post_only:
+        limit["postOnly"] = True
+    return {"limit": limit}
 
+
+def bulk_place(exchange: Any, orders: Sequence[OrderSpec]) -> List[Any]:
+    # All specs in one signed bulk_orders action (one nonce, one round trip). The venue answers with one status
+    # per order in request order; each is re-wrapped as a single-order response so callers parse it exactly like
+    # an exchange.order() reply. A rejected batch (status != "ok" or a status count mismatch) is returned as-is
+    # for every spec.
+    requests = [
+        {
+            "coin": o.symbol,
+            "is_buy": o.side.upper() == "BUY",
+            "sz": float(o.qty),
+            "limit_px": float(o.price),
+            "order_type": _order_type(o.tif, o.post_only),
+            "reduce_only": o.reduce_only,
+        }
+        for o in orders
+    ]
+    resp = exchange.bulk_orders(requests)
+    try:
+        response = resp["response"]
+        statuses = response["data"]["statuses"]
+        ok = resp.get("status") == "ok" and len(statuses) == len(requests)
+    except (KeyError, TypeError):
+        ok = False
+    if not ok:
+        return [resp] * len(requests)
+    return [
+        {"status": "ok", "response": {"type": response.get("type", "order"), "data": {"statuses": [st]}}}
+        for st in statuses
+    ]
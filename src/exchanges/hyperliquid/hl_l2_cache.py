@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # annotations only; the info object is passed in by the adapter
+    from hyperliquid.info import Info  # type: ignore
+
+# A pushed book older than this is treated as missing (stalled or reconnecting stream) and callers fall back to REST
+_DEFAULT_STALENESS_S = 2.0
+
+# What subscribe() can raise: no websocket (skip_ws), unknown name in name_to_coin, transport/payload errors
+_SUBSCRIBE_ERRORS = (RuntimeError, KeyError, ValueError, OSError)
+
+
+class HyperliquidL2Cache:
+    # Latest l2Book push per symbol from the SDK websocket. get() returns it without a round trip while fresh;
+    # the first get() for a symbol subscribes, so only books that are actually read are streamed.
+    def __init__(self, info: Info, staleness_s: float = _DEFAULT_STALENESS_S) -> None:
+        self.info = info
+        self.staleness_s = staleness_s
+        # symbol -> (monotonic receive time, {"coin", "levels", "time"}); written by the websocket thread
+        self._books: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._subscribed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        hit = self._books.get(symbol)
+        if hit is None:
+            self._ensure_subscribed(symbol)
+            return None
+        if time.monotonic() - hit[0] > self.staleness_s:
+            return None
+        return hit[1]
+
+    def _ensure_subscribed(self, symbol: str) -> None:
+        with self._lock:
+            if symbol in self._subscribed:
+                return
+            # Attempted once; without a websocket every read simply stays on REST
+            self._subscribed.add(symbol)
+        if getattr(self.info, "ws_manager", None) is None:
+            return
+        try:
+            self.info.subscribe({"type": "l2Book", "coin": symbol}, lambda msg: self._on_book(symbol, msg))
+        except _SUBSCRIBE_ERRORS:
+            pass
+
+    def _on_book(self, symbol: str, msg: Any) -> None:
+        data = msg.get("data") if isinstance(msg, dict) else None
+        if isinstance(data, dict) and data.get("levels"):
+            self._books[symbol] = (time.monotonic(), data)
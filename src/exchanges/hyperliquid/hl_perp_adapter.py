@@ -1,17 +1,15 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
 
-try:  # Allow tests to run without the SDK installed
+if TYPE_CHECKING:  # annotations only; clients are built by Credentials.build_hl_clients()
     from hyperliquid.info import Info  # type: ignore
     from hyperliquid.exchange import Exchange  # type: ignore
-except Exception:  # pragma: no cover - fallback for environments without SDK
-    Info = Any  # type: ignore
-    Exchange = Any  # type: ignore
 
-from src.exchanges.base_gateway import ExchangeGateway, SymbolMeta
-from src.exchanges.hyperliquid.hl_common import best_bid_ask, infer_tick_from_l2
+from src.exchanges.base_gateway import ExchangeGateway, OrderSpec, SymbolMeta, top_of_book
+from src.exchanges.hyperliquid.hl_common import bulk_place, infer_tick_from_l2
+from src.exchanges.hyperliquid.hl_l2_cache import HyperliquidL2Cache
 
 
 class HyperliquidPerpAdapter(ExchangeGateway):
@@ -19,8 +17,24 @@ class HyperliquidPerpAdapter(ExchangeGateway):
         self.address = address
         self.info = info
         self.exchange = exchange
+        # Websocket-fed books; get_l2() falls back to a REST snapshot when none is fresh
+        self._l2 = HyperliquidL2Cache(info)
+        # Symbols whose 1x leverage setup has been attempted; see _ensure_leverage()
+        self._leverage_done: set[str] = set()
+        # Perp name -> row index in metaAndAssetCtxs; rebuilt when the universe changes, see get_funding()
+        self._name_to_idx: Dict[str, int] = {}
+        self._universe_len = 0
+        # raw symbol -> normalized name; only successful resolutions are kept, see normalize_symbol()
+        self._norm_cache: Dict[str, str] = {}
 
     def normalize_symbol(self, raw_symbol: str) -> str:
+        hit = self._norm_cache.get(raw_symbol)
+        if hit is None:
+            # Unknown names raise and are not cached, so a symbol listed later still resolves
+            hit = self._norm_cache[raw_symbol] = self._resolve_symbol(raw_symbol)
+        return hit
+
+    def _resolve_symbol(self, raw_symbol: str) -> str:
         candidate = raw_symbol.strip()
         if candidate in self.info.name_to_coin:
             return candidate
@@ -44,7 +58,8 @@ class HyperliquidPerpAdapter(ExchangeGateway):
         return SymbolMeta(symbol=symbol, venue="hyperliquid", kind="perp", tick=tick, size_decimals=size_decimals)
 
     def get_l2(self, symbol: str) -> Dict[str, Any]:
-        return self.info.l2_snapshot(symbol)
+        book = self._l2.get(symbol)
+        return book if book is not None else self.info.l2_snapshot(symbol)
 
     def get_balances(self) -> Dict[str, Any]:
         return self.info.user_state(self.address)
@@ -60,11 +75,14 @@ class HyperliquidPerpAdapter(ExchangeGateway):
         ctx = self.info.meta_and_asset_ctxs()
         # meta_and_asset_ctxs returns [meta, assetCtxs]
         asset_ctxs = ctx[1] if isinstance(ctx, list) and len(ctx) > 1 else []
-        latest = None
-        for m, a in zip(ctx[0]["universe"], asset_ctxs):
-            if m.get("name") == symbol:
-                latest = a
-                break
+        universe = ctx[0]["universe"]
+        idx = self._name_to_idx.get(symbol)
+        # Rebuild on a listing change (size differs) or if the cached row no longer holds this symbol
+        if len(universe) != self._universe_len or (idx is not None and universe[idx].get("name") != symbol):
+            self._name_to_idx = {m.get("name"): i for i, m in enumerate(universe)}
+            self._universe_len = len(universe)
+            idx = self._name_to_idx.get(symbol)
+        latest = asset_ctxs[idx] if idx is not None and idx < len(asset_ctxs) else None
         return {
             "symbol": symbol,
             "funding": latest.get("funding") if isinstance(latest, dict) else None,
@@ -87,26 +105,41 @@ class HyperliquidPerpAdapter(ExchangeGateway):
             order_type["limit"]["postOnly"] = True
         if reduce_only:
             order_type["reduceOnly"] = True
-        try:
-            # Try to set leverage to 1x before placing orders (idempotent on most venues)
-            if hasattr(self.exchange, "configure_leverage"):
-                try:
-                    # Some SDKs use integer bps or float; we try both patterns
-                    self.exchange.configure_leverage(symbol, 1)  # type: ignore[arg-type]
-                except Exception:
-                    try:
-                        self.exchange.configure_leverage(symbol, 1.0)  # type: ignore[arg-type]
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        self.prepare_symbol(symbol)
         return self.exchange.order(symbol, is_buy, float(qty), float(price), order_type)
 
+    def prepare_symbol(self, symbol: str) -> None:
+        if symbol not in self._leverage_done:
+            self._ensure_leverage(symbol)
+
+    def _ensure_leverage(self, symbol: str) -> None:
+        # Set leverage to 1x before the first order on a symbol (idempotent on most venues). Attempted once per
+        # symbol: the outcome does not change between orders, so later orders skip the probe entirely.
+        self._leverage_done.add(symbol)
+        configure = getattr(self.exchange, "configure_leverage", None)
+        if configure is None:
+            return
+        # Some SDKs use integer bps or float; we try both patterns
+        for leverage in (1, 1.0):
+            try:
+                configure(symbol, leverage)
+                return
+            except Exception:
+                continue
+
+    def place_orders(self, orders: Sequence[OrderSpec]) -> List[Any]:
+        # Single bulk_orders request; SDKs without it fall back to one order() per spec
+        if not hasattr(self.exchange, "bulk_orders"):
+            return super().place_orders(orders)
+        for o in orders:
+            self.prepare_symbol(o.symbol)
+        return bulk_place(self.exchange, orders)
+
     def cancel_order(self, symbol: str, oid: int) -> Any:
         return self.exchange.cancel(symbol, oid)
 
     # Convenience
     def best_bid_ask(self, symbol: str) -> tuple[Decimal, Decimal]:
-        return best_bid_ask(self.info, symbol)
+        return top_of_book(self.get_l2(symbol))
 
 
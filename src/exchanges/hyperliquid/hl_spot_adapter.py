@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import time
 from decimal import Decimal
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
 
-try:  # Allow tests to run without the SDK installed
+if TYPE_CHECKING:  # annotations only; clients are built by Credentials.build_hl_clients()
     from hyperliquid.info import Info  # type: ignore
     from hyperliquid.exchange import Exchange  # type: ignore
-except Exception:  # pragma: no cover - fallback for environments without SDK
-    Info = Any  # type: ignore
-    Exchange = Any  # type: ignore
 
-from src.exchanges.base_gateway import ExchangeGateway, SymbolMeta
-from src.exchanges.hyperliquid.hl_common import best_bid_ask, infer_tick_from_l2
+from src.exchanges.base_gateway import ExchangeGateway, OrderSpec, SymbolMeta, top_of_book
+from src.exchanges.hyperliquid.hl_common import bulk_place, infer_tick_from_l2
+from src.exchanges.hyperliquid.hl_l2_cache import HyperliquidL2Cache
+
+# The tick is inferred from the live book (an L2 request), so metas are reused but refreshed hourly
+_META_TTL_S = 3600.0
 
 
 class HyperliquidSpotAdapter(ExchangeGateway):
@@ -19,8 +21,21 @@ class HyperliquidSpotAdapter(ExchangeGateway):
         self.address = address
         self.info = info
         self.exchange = exchange
+        # Websocket-fed books; get_l2() falls back to a REST snapshot when none is fresh
+        self._l2 = HyperliquidL2Cache(info)
+        # raw symbol -> normalized pair; only successful resolutions are kept, see normalize_symbol()
+        self._norm_cache: Dict[str, str] = {}
+        # symbol -> (monotonic fetch time, meta); see get_symbol_meta()
+        self._meta_cache: Dict[str, Tuple[float, SymbolMeta]] = {}
 
     def normalize_symbol(self, raw_symbol: str) -> str:
+        hit = self._norm_cache.get(raw_symbol)
+        if hit is None:
+            # Unknown names raise and are not cached, so a pair listed later still resolves
+            hit = self._norm_cache[raw_symbol] = self._resolve_symbol(raw_symbol)
+        return hit
+
+    def _resolve_symbol(self, raw_symbol: str) -> str:
         candidate = raw_symbol.strip()
         if "/" in candidate:
             if candidate in self.info.name_to_coin:
@@ -37,6 +52,13 @@ class HyperliquidSpotAdapter(ExchangeGateway):
         raise ValueError(candidate)
 
     def get_symbol_meta(self, symbol: str) -> SymbolMeta:
+        now = time.monotonic()
+        hit = self._meta_cache.get(symbol)
+        if hit is None or now - hit[0] > _META_TTL_S:
+            hit = self._meta_cache[symbol] = (now, self._fetch_symbol_meta(symbol))
+        return hit[1]
+
+    def _fetch_symbol_meta(self, symbol: str) -> SymbolMeta:
         asset = self.info.name_to_asset(symbol)
         size_decimals = int(self.info.asset_to_sz_decimals[asset])
         tick = infer_tick_from_l2(self.info, symbol)
@@ -46,7 +68,8 @@ class HyperliquidSpotAdapter(ExchangeGateway):
         return SymbolMeta(symbol=symbol, venue="hyperliquid", kind="spot", tick=tick, size_decimals=size_decimals)
 
     def get_l2(self, symbol: str) -> Dict[str, Any]:
-        return self.info.l2_snapshot(symbol)
+        book = self._l2.get(symbol)
+        return book if book is not None else self.info.l2_snapshot(symbol)
 
     def get_balances(self) -> Dict[str, Any]:
         return self.info.spot_user_state(self.address)
@@ -78,11 +101,17 @@ class HyperliquidSpotAdapter(ExchangeGateway):
             order_type["limit"]["postOnly"] = True
         return self.exchange.order(symbol, is_buy, float(qty), float(price), order_type)
 
+    def place_orders(self, orders: Sequence[OrderSpec]) -> List[Any]:
+        # Single bulk_orders request; SDKs without it fall back to one order() per spec
+        if not hasattr(self.exchange, "bulk_orders"):
+            return super().place_orders(orders)
+        return bulk_place(self.exchange, orders)
+
     def cancel_order(self, symbol: str, oid: int) -> Any:
         return self.exchange.cancel(symbol, oid)
 
     # Convenience
     def best_bid_ask(self, symbol: str) -> tuple[Decimal, Decimal]:
-        return best_bid_ask(self.info, symbol)
+        return top_of_book(self.get_l2(symbol))
 
 
@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional
 from src.exchanges.base_gateway import ExchangeGateway
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderParams:
     tif: str = "Gtc"
     post_only: bool = True
@@ -2,62 +2,63 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Tuple
+from typing import Optional, Tuple
 
-from src.exchanges.base_gateway import ExchangeGateway
+from src.core.num import TWO, ZERO, size_quantum
+from src.exchanges.base_gateway import ExchangeGateway, top_of_book
 
 
 def _best_bid_ask(gw: ExchangeGateway, symbol: str) -> Tuple[Decimal, Decimal]:
-    l2 = gw.get_l2(symbol)
-    levels = l2.get("levels") or []
-    bids = levels[0] if len(levels) > 0 else []
-    asks = levels[1] if len(levels) > 1 else []
-    bid = Decimal(str(bids[0]["px"])) if bids else Decimal("0")
-    ask = Decimal(str(asks[0]["px"])) if asks else Decimal("0")
-    return bid, ask
+    return top_of_book(gw.get_l2(symbol))
 
 
-def _quantize_size(qty: Decimal, size_decimals: int) -> Decimal:
-    quantum = Decimal(1).scaleb(-size_decimals)
-    return (qty // quantum) * quantum
-
-
-@dataclass
+@dataclass(slots=True)
 class QuoteParams:
     price_offset_ticks: int = 1
 
 
 class QuoteEngine:
-    def __init__(self, gateway: ExchangeGateway, symbol: str) -> None:
+    def __init__(self, gateway: ExchangeGateway, symbol: str, params: Optional[QuoteParams] = None) -> None:
         self.gw = gateway
         self.symbol = symbol
         self.meta = self.gw.get_symbol_meta(symbol)
+        self.params = params or QuoteParams()
+        # Fixed per engine once the meta is known: tick multiples and the size quantum
+        self._tick = self.meta.tick
+        self._tick2 = self._tick * TWO
+        self._tick_offset = self._tick * Decimal(self.params.price_offset_ticks)
+        self._quantum = size_quantum(self.meta.size_decimals)
+
+    def _offset(self, offset_ticks: int) -> Decimal:
+        if offset_ticks == self.params.price_offset_ticks:
+            return self._tick_offset
+        return self._tick * Decimal(offset_ticks)
 
     def passive_buy_price(self, offset_ticks: int) -> Decimal:
         bid, ask = _best_bid_ask(self.gw, self.symbol)
-        px = bid + self.meta.tick * Decimal(offset_ticks)
+        tick = self._tick
+        px = bid + self._offset(offset_ticks)
         if ask > 0:
             spread = ask - bid
             # Avoid equality with passive sell when spread == 2 * tick by falling back to bid
-            if spread <= self.meta.tick * Decimal(2) and px >= ask - self.meta.tick:
+            if spread <= self._tick2 and px >= ask - tick:
                 return bid
             if px >= ask:
-                px = max(bid, ask - self.meta.tick)
+                px = max(bid, ask - tick)
         return px
 
     def passive_sell_price(self, offset_ticks: int) -> Decimal:
         bid, ask = _best_bid_ask(self.gw, self.symbol)
-        px = ask - self.meta.tick * Decimal(offset_ticks)
+        px = ask - self._offset(offset_ticks)
         if bid > 0 and px <= bid:
-            px = min(ask, bid + self.meta.tick)
+            px = min(ask, bid + self._tick)
         return px
 
     def base_qty_from_usd(self, target_usd_notional: Decimal) -> Decimal:
         bid, ask = _best_bid_ask(self.gw, self.symbol)
-        mid = (bid + ask) / Decimal(2) if ask > 0 else bid
+        mid = (bid + ask) / TWO if ask > 0 else bid
         if mid <= 0:
-            return Decimal("0")
+            return ZERO
         raw = target_usd_notional / mid
-        return _quantize_size(raw, self.meta.size_decimals)
-
-
+        quantum = self._quantum
+        return (raw // quantum) * quantum
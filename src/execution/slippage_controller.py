@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 
-@dataclass
+@dataclass(slots=True)
 class SlippageController:
     max_bps: int
+    # max_bps as a fraction of price (bps * 1e-4), built once instead of two Decimals and a divide per call
+    _max_frac: Decimal = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._max_frac = Decimal(self.max_bps).scaleb(-4)
 
     def enforce(self, reference_px: Decimal, proposed_px: Decimal, is_buy: bool) -> Decimal:
         if reference_px <= 0:
             return proposed_px
-        max_move = (reference_px * Decimal(self.max_bps)) / Decimal(10000)
+        max_move = reference_px * self._max_frac
         if is_buy:
             # cap above reference
             return min(proposed_px, reference_px + max_move)
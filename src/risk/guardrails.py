@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from decimal import Decimal
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawdownGuard:
     max_drawdown_usd: Decimal
     _peak: Decimal = Decimal("0")
@@ -1,23 +1,29 @@
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class NotionalLimiter:
     per_symbol_cap: Decimal
     portfolio_cap: Decimal
     symbol_to_notional: Dict[str, Decimal] = field(default_factory=dict)
+    # Running sum of symbol_to_notional, kept in step by apply() so checks do not re-sum every symbol
+    _portfolio_total: Decimal = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._portfolio_total = sum(self.symbol_to_notional.values(), Decimal("0"))
 
     def can_add(self, symbol: str, delta_usd: Decimal) -> bool:
         cur_symbol = self.symbol_to_notional.get(symbol, Decimal("0"))
         new_symbol = cur_symbol + delta_usd
         if new_symbol < 0:
             new_symbol = Decimal("0")
-        portfolio_total = sum(self.symbol_to_notional.values()) + delta_usd
+        portfolio_total = self._portfolio_total + delta_usd
         if portfolio_total < 0:
             portfolio_total = Decimal("0")
         return new_symbol <= self.per_symbol_cap and portfolio_total <= self.portfolio_cap
@@ -25,22 +31,28 @@ class NotionalLimiter:
     def apply(self, symbol: str, delta_usd: Decimal) -> None:
         if not self.can_add(symbol, delta_usd):
             raise ValueError("Notional cap exceeded")
-        self.symbol_to_notional[symbol] = self.symbol_to_notional.get(symbol, Decimal("0")) + delta_usd
-        if self.symbol_to_notional[symbol] < 0:
-            self.symbol_to_notional[symbol] = Decimal("0")
+        old = self.symbol_to_notional.get(symbol, Decimal("0"))
+        new = old + delta_usd
+        if new < 0:
+            new = Decimal("0")
+        self.symbol_to_notional[symbol] = new
+        self._portfolio_total += new - old
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderRateLimiter:
     max_actions_per_min: int
-    _times: list[float] = field(default_factory=list)
+    # Action timestamps, oldest first. Monotonic time keeps them ordered, so expiry only ever pops the head.
+    _times: deque[float] = field(default_factory=deque)
 
     def allow(self) -> bool:
-        now = time.time()
+        now = time.monotonic()
         one_min_ago = now - 60
-        self._times = [t for t in self._times if t >= one_min_ago]
-        if len(self._times) < self.max_actions_per_min:
-            self._times.append(now)
+        times = self._times
+        while times and times[0] < one_min_ago:
+            times.popleft()
+        if len(times) < self.max_actions_per_min:
+            times.append(now)
             return True
         return False
 
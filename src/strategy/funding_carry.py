@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any, Dict, Optional, Tuple
 
-from src.exchanges.base_gateway import ExchangeGateway
+from src.core.num import TWO, ZERO, quantize_size, to_dec
+from src.exchanges.base_gateway import ExchangeGateway, OrderSpec, SymbolMeta, top_of_book
 
+# The tick is inferred from the live book and can go stale after a large move (a price crossing a power of ten
+# changes it); the strategy prices off it, so metas are reused but refetched hourly, like the adapters' caches
+_META_TTL_S = 3600.0
 
-@dataclass
+
+@dataclass(slots=True)
 class StrategyConfig:
     enter_threshold_apr: Decimal
     exit_threshold_apr: Decimal
@@ -19,18 +25,52 @@ class StrategyConfig:
 
 
 def _best_bid_ask_from_l2(gw: ExchangeGateway, symbol: str) -> Tuple[Decimal, Decimal]:
-    l2 = gw.get_l2(symbol)
-    levels = l2.get("levels") or []
-    bids = levels[0] if len(levels) > 0 else []
-    asks = levels[1] if len(levels) > 1 else []
-    best_bid = Decimal(str(bids[0]["px"])) if bids else Decimal("0")
-    best_ask = Decimal(str(asks[0]["px"])) if asks else Decimal("0")
-    return best_bid, best_ask
+    return top_of_book(gw.get_l2(symbol))
+
+
+def _find_balance(data: Any, coin_upper: str) -> Optional[Dict[str, Any]]:
+    # { balances: [ { coin|symbol|asset, total|balance|available } ] }; case-insensitive, first match wins
+    if not isinstance(data, dict) or not isinstance(data.get("balances"), list):
+        return None
+    return next(
+        (b for b in data["balances"] if str(b.get("coin") or b.get("symbol") or b.get("asset")).upper() == coin_upper),
+        None,
+    )
 
 
-def _quantize_size(qty: Decimal, size_decimals: int) -> Decimal:
-    quantum = Decimal(1).scaleb(-size_decimals)
-    return (qty // quantum) * quantum
+def _statuses(resp: Any) -> Any:
+    # resp -> response -> data -> statuses, tolerating missing/None levels without building defaults
+    return (((resp or {}).get("response") or {}).get("data") or {}).get("statuses") or ()
+
+
+def _parse_statuses(statuses: Any) -> Tuple[bool, Decimal, Decimal, Optional[int]]:
+    # One pass over an order's statuses: (any error, first fill size, its avg px, first resting oid).
+    # A malformed fill or oid entry is skipped and reads as "none".
+    has_error = False
+    fill: Optional[Tuple[Decimal, Decimal]] = None
+    oid: Optional[int] = None
+    for s in statuses:
+        # Non-dict entries ("success" strings) are skipped: "error" in a str would be a substring test
+        if not isinstance(s, dict):
+            continue
+        if "error" in s:
+            has_error = True
+        if fill is None:
+            f = s.get("filled")
+            if f is not None:
+                try:
+                    fill = (Decimal(str(f.get("totalSz", "0"))), Decimal(str(f.get("avgPx", "0"))))
+                except Exception:
+                    pass
+        if oid is None:
+            r = s.get("resting")
+            if r is not None:
+                try:
+                    oid = int(r["oid"])
+                except (KeyError, TypeError, ValueError):
+                    pass
+    sz, avg = fill if fill is not None else (ZERO, ZERO)
+    return has_error, sz, avg, oid
 
 
 class FundingCarryStrategy:
@@ -47,6 +87,20 @@ class FundingCarryStrategy:
         self.spot_symbol = spot_symbol
         self.perp_symbol = perp_symbol
         self.cfg = config
+        # Quote currency of the spot pair ("ASTER/USDT" -> "USDT"), parsed once; None when there is no "/"
+        parts = spot_symbol.split("/")
+        self._quote_ccy: Optional[str] = parts[1].upper() if len(parts) > 1 else None
+        # Tick and size decimals: fetched on first use, then reused until _META_TTL_S has passed (monotonic)
+        self._spot_meta: Optional[SymbolMeta] = None
+        self._perp_meta: Optional[SymbolMeta] = None
+        self._meta_ts = 0.0
+        # Legs routed through one exchange client with a bulk endpoint go out as a single place_orders() batch.
+        # Otherwise (cross-venue, or an SDK without bulk_orders) the perp leg is only sent once the spot leg is
+        # accepted: the per-spec fallback would route the perp order through the spot adapter even after a reject.
+        spot_ex = getattr(spot, "exchange", None)
+        self._batch_orders = (
+            spot_ex is not None and spot_ex is getattr(perp, "exchange", None) and hasattr(spot_ex, "bulk_orders")
+        )
 
     def compute_expected_funding_apr(self) -> Optional[Decimal]:
         info = self.perp.get_funding(self.perp_symbol)
@@ -54,29 +108,41 @@ class FundingCarryStrategy:
         if raw is None:
             return None
         try:
-            rate = Decimal(str(raw))
+            # Same venue string poll after poll until the funding window rolls; the parse cache makes repeats free
+            rate = to_dec(raw)
         except Exception:
             return None
         # Treat the provided rate as per-window funding; for phase 1 tests, compare directly
         return rate
 
-    def _compute_target_qtys(self) -> Tuple[Decimal, Decimal]:
-        spot_meta = self.spot.get_symbol_meta(self.spot_symbol)
-        perp_meta = self.perp.get_symbol_meta(self.perp_symbol)
+    def _metas(self) -> Tuple[SymbolMeta, SymbolMeta]:
+        now = time.monotonic()
+        if self._spot_meta is None or self._perp_meta is None or now - self._meta_ts > _META_TTL_S:
+            self._spot_meta = self.spot.get_symbol_meta(self.spot_symbol)
+            self._perp_meta = self.perp.get_symbol_meta(self.perp_symbol)
+            self._meta_ts = now
+        return self._spot_meta, self._perp_meta
+
+    def _books(self) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+        # Read one after the other: the adapters serve get_l2 from their websocket book cache, so a read is
+        # normally a local lookup rather than a round-trip worth overlapping on a thread
         sbid, sask = _best_bid_ask_from_l2(self.spot, self.spot_symbol)
         pbid, pask = _best_bid_ask_from_l2(self.perp, self.perp_symbol)
-        spot_mid = (sbid + sask) / Decimal(2) if sask > 0 else sbid
-        perp_mid = (pbid + pask) / Decimal(2) if pask > 0 else pbid
+        return sbid, sask, pbid, pask
+
+    def _compute_target_qtys(
+        self, spot_meta: SymbolMeta, perp_meta: SymbolMeta, sbid: Decimal, sask: Decimal, pbid: Decimal, pask: Decimal
+    ) -> Tuple[Decimal, Decimal]:
+        spot_mid = (sbid + sask) / TWO if sask > 0 else sbid
+        perp_mid = (pbid + pask) / TWO if pask > 0 else pbid
         if spot_mid <= 0 or perp_mid <= 0:
-            return Decimal("0"), Decimal("0")
+            return ZERO, ZERO
         base_qty = (self.cfg.target_usd_notional / spot_mid) * self.cfg.hedge_ratio
-        spot_qty = _quantize_size(base_qty, spot_meta.size_decimals)
-        perp_qty = _quantize_size(base_qty, perp_meta.size_decimals)
+        spot_qty = quantize_size(base_qty, spot_meta.size_decimals)
+        perp_qty = quantize_size(base_qty, perp_meta.size_decimals)
         return spot_qty, perp_qty
 
-    def _price_for_side(self, gw: ExchangeGateway, symbol: str, side: str, offset_ticks: int) -> Decimal:
-        meta = gw.get_symbol_meta(symbol)
-        bid, ask = _best_bid_ask_from_l2(gw, symbol)
+    def _price_for_side(self, meta: SymbolMeta, bid: Decimal, ask: Decimal, side: str, offset_ticks: int) -> Decimal:
         if side.upper() == "BUY":
             # passive buy just inside the bid
             price = bid + meta.tick * Decimal(offset_ticks)
@@ -89,9 +155,8 @@ class FundingCarryStrategy:
                 price = min(ask, bid + meta.tick)
             return price
 
-    def evaluate_and_place(self) -> Dict[str, Any]:
-        apr = self.compute_expected_funding_apr()
-        result: Dict[str, Any] = {
+    def _no_entry(self, apr: Optional[Decimal]) -> Dict[str, Any]:
+        return {
             "apr": apr,
             "entered": False,
             "orders": [],
@@ -100,38 +165,55 @@ class FundingCarryStrategy:
             "spot_filled_usd": "0",
             "perp_filled_usd": "0",
         }
-        if apr is None:
+
+    def evaluate_and_place(self) -> Dict[str, Any]:
+        apr = self.compute_expected_funding_apr()
+        # Negative funding path can be added later behind risk toggle
+        if apr is None or apr < self.cfg.enter_threshold_apr:
+            # The common case: no meta, book or balance reads, just the no-entry result
+            return self._no_entry(apr)
+        result = self._no_entry(apr)
+        # Positive funding: long spot, short perp
+        # One book read per leg; sizing, pricing and the reported best quotes all use the same snapshot
+        spot_meta, perp_meta = self._metas()
+        sbid, sask, pbid, pask = self._books()
+        spot_qty, perp_qty = self._compute_target_qtys(spot_meta, perp_meta, sbid, sask, pbid, pask)
+        if spot_qty <= 0 or perp_qty <= 0:
             return result
-        if apr >= self.cfg.enter_threshold_apr:
-            # Positive funding: long spot, short perp
-            spot_qty, perp_qty = self._compute_target_qtys()
-            if spot_qty <= 0 or perp_qty <= 0:
-                return result
 
-            spot_px = self._price_for_side(self.spot, self.spot_symbol, "BUY", self.cfg.price_offset_ticks)
-            perp_px = self._price_for_side(self.perp, self.perp_symbol, "SELL", self.cfg.price_offset_ticks)
-            sbid, sask = _best_bid_ask_from_l2(self.spot, self.spot_symbol)
-            pbid, pask = _best_bid_ask_from_l2(self.perp, self.perp_symbol)
-
-            # Pre-check: ensure sufficient spot quote balance to buy intended base size
-            try:
-                quote_ccy = self.spot_symbol.split("/")[1]
-                balances = self.spot.get_balances()
-                quote_bal = Decimal("0")
-                if isinstance(balances, dict) and isinstance(balances.get("balances"), list):
-                    for b in balances["balances"]:
-                        coin = b.get("coin") or b.get("symbol") or b.get("asset")
-                        if str(coin).upper() == quote_ccy.upper():
-                            total = b.get("total") or b.get("balance") or b.get("available")
-                            quote_bal = Decimal(str(total))
-                            break
-                needed_quote = (spot_qty * spot_px)
-                if quote_bal <= 0 or needed_quote > quote_bal:
-                    return result
-            except Exception:
+        spot_px = self._price_for_side(spot_meta, sbid, sask, "BUY", self.cfg.price_offset_ticks)
+        perp_px = self._price_for_side(perp_meta, pbid, pask, "SELL", self.cfg.price_offset_ticks)
+
+        # Pre-check: ensure sufficient spot quote balance to buy intended base size
+        try:
+            quote_ccy = self._quote_ccy
+            if quote_ccy is None:
                 return result
+            balances = self.spot.get_balances()
+            quote_bal = ZERO
+            b = _find_balance(balances, quote_ccy)
+            if b is not None:
+                total = b.get("total") or b.get("balance") or b.get("available")
+                quote_bal = Decimal(str(total))
+            needed_quote = (spot_qty * spot_px)
+            if quote_bal <= 0 or needed_quote > quote_bal:
+                return result
+        except Exception:
+            return result
 
-            # Place spot first; if it fails, abort atomic entry
+        spot_spec = OrderSpec(
+            self.spot_symbol, "BUY", spot_qty, spot_px, tif=self.cfg.tif, post_only=self.cfg.post_only
+        )
+        perp_spec = OrderSpec(
+            self.perp_symbol, "SELL", perp_qty, perp_px, tif=self.cfg.tif, post_only=self.cfg.post_only
+        )
+        if self._batch_orders:
+            # Both legs in one request; a rejected spot leg means the perp leg was sent anyway and is unwound.
+            # The batch goes through the spot adapter, so the perp adapter's per-symbol setup (leverage) runs here.
+            self.perp.prepare_symbol(self.perp_symbol)
+            spot_resp, perp_resp = self.spot.place_orders((spot_spec, perp_spec))
+        else:
+            # Place spot first; if it fails, abort atomic entry before the perp leg is sent
             spot_resp = self.spot.place_order(
                 self.spot_symbol,
                 "BUY",
@@ -141,21 +223,22 @@ class FundingCarryStrategy:
                 reduce_only=False,
                 post_only=self.cfg.post_only,
             )
-            # Detect error on spot leg
-            try:
-                statuses = ((spot_resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                if any(isinstance(s, dict) and "error" in s for s in statuses):
-                    result["orders"] = [spot_resp]
-                    result["spot_qty"] = str(spot_qty)
-                    result["perp_qty"] = str(perp_qty)
-                    result["spot_px"] = str(spot_px)
-                    result["perp_px"] = str(perp_px)
-                    result["spot_best"] = {"bid": str(sbid), "ask": str(sask)}
-                    result["perp_best"] = {"bid": str(pbid), "ask": str(pask)}
-                    return result
-            except Exception:
-                return result
+        # Detect error on spot leg
+        try:
+            spot_has_error, spot_filled_sz, spot_filled_avg, spot_oid = _parse_statuses(_statuses(spot_resp))
+        except Exception:
+            spot_has_error, spot_filled_sz, spot_filled_avg, spot_oid = True, ZERO, ZERO, None
+        if spot_has_error and not self._batch_orders:
+            result["orders"] = [spot_resp]
+            result["spot_qty"] = str(spot_qty)
+            result["perp_qty"] = str(perp_qty)
+            result["spot_px"] = str(spot_px)
+            result["perp_px"] = str(perp_px)
+            result["spot_best"] = {"bid": str(sbid), "ask": str(sask)}
+            result["perp_best"] = {"bid": str(pbid), "ask": str(pask)}
+            return result
 
+        if not self._batch_orders:
             # Place perp leg; if it errors, attempt to cancel spot if resting
             perp_resp = self.perp.place_order(
                 self.perp_symbol,
@@ -167,42 +250,22 @@ class FundingCarryStrategy:
                 post_only=self.cfg.post_only,
             )
 
-            # Parse fills for accurate notional bookkeeping
-            def _filled(resp: Any) -> Tuple[Decimal, Decimal, Decimal]:
-                try:
-                    statuses = ((resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                    for s in statuses:
-                        if isinstance(s, dict) and "filled" in s:
-                            f = s["filled"]
-                            sz = Decimal(str(f.get("totalSz", "0")))
-                            avg = Decimal(str(f.get("avgPx", "0")))
-                            return sz * avg, sz, avg
-                except Exception:
-                    pass
-                return Decimal("0"), Decimal("0"), Decimal("0")
-
-            spot_filled_usd, spot_filled_sz, spot_filled_avg = _filled(spot_resp)
-            perp_filled_usd, perp_filled_sz, perp_filled_avg = _filled(perp_resp)
-
-            # Check perp errors and try to revert spot if needed
-            try:
-                perp_statuses = ((perp_resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                perp_has_error = any(isinstance(s, dict) and "error" in s for s in perp_statuses)
-            except Exception:
-                perp_has_error = True
-            if perp_has_error:
+        # Parse fills for accurate notional bookkeeping; a perp response that cannot be read counts as an error
+        try:
+            perp_has_error, perp_filled_sz, perp_filled_avg, perp_oid = _parse_statuses(_statuses(perp_resp))
+        except Exception:
+            perp_has_error, perp_filled_sz, perp_filled_avg, perp_oid = True, ZERO, ZERO, None
+
+        if spot_has_error:
+            # Batched entry with a rejected spot leg: the perp leg was sent regardless. Pull what still rests; a perp
+            # fill is a naked short, reported as an entry with no spot fill so the runner starts its hedge repair.
+            if perp_oid is not None:
                 try:
-                    statuses = ((spot_resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                    for s in statuses:
-                        if isinstance(s, dict) and "resting" in s and "oid" in s["resting"]:
-                            oid = int(s["resting"]["oid"])
-                            try:
-                                self.spot.cancel_order(self.spot_symbol, oid)  # type: ignore[attr-defined]
-                            except Exception:
-                                pass
-                            break
+                    self.perp.cancel_order(self.perp_symbol, perp_oid)
                 except Exception:
                     pass
+                perp_oid = None
+            if perp_has_error or perp_filled_sz <= 0:
                 result["orders"] = [spot_resp, perp_resp]
                 result["spot_qty"] = str(spot_qty)
                 result["perp_qty"] = str(perp_qty)
@@ -210,15 +273,18 @@ class FundingCarryStrategy:
                 result["perp_px"] = str(perp_px)
                 result["spot_best"] = {"bid": str(sbid), "ask": str(sask)}
                 result["perp_best"] = {"bid": str(pbid), "ask": str(pask)}
-                result["spot_filled_usd"] = str(spot_filled_usd)
-                result["perp_filled_usd"] = str(perp_filled_usd)
-                result["spot_filled_sz"] = str(spot_filled_sz)
-                result["perp_filled_sz"] = str(perp_filled_sz)
-                result["spot_filled_avg_px"] = str(spot_filled_avg)
-                result["perp_filled_avg_px"] = str(perp_filled_avg)
                 return result
+            spot_filled_sz, spot_filled_avg, spot_oid = ZERO, ZERO, None
+        spot_filled_usd = spot_filled_sz * spot_filled_avg
+        perp_filled_usd = perp_filled_sz * perp_filled_avg
 
-            result["entered"] = True
+        # Try to revert spot if the perp leg failed
+        if perp_has_error:
+            if spot_oid is not None:
+                try:
+                    self.spot.cancel_order(self.spot_symbol, spot_oid)  # type: ignore[attr-defined]
+                except Exception:
+                    pass
             result["orders"] = [spot_resp, perp_resp]
             result["spot_qty"] = str(spot_qty)
             result["perp_qty"] = str(perp_qty)
@@ -232,24 +298,26 @@ class FundingCarryStrategy:
             result["perp_filled_sz"] = str(perp_filled_sz)
             result["spot_filled_avg_px"] = str(spot_filled_avg)
             result["perp_filled_avg_px"] = str(perp_filled_avg)
-            try:
-                ss = ((spot_resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                for s in ss:
-                    if isinstance(s, dict) and "resting" in s and "oid" in s["resting"]:
-                        result["spot_oid"] = int(s["resting"]["oid"])
-                        break
-            except Exception:
-                pass
-            try:
-                ps = ((perp_resp or {}).get("response") or {}).get("data", {}).get("statuses", [])
-                for s in ps:
-                    if isinstance(s, dict) and "resting" in s and "oid" in s["resting"]:
-                        result["perp_oid"] = int(s["resting"]["oid"])
-                        break
-            except Exception:
-                pass
             return result
-        # Negative funding path can be added later behind risk toggle
+
+        result["entered"] = True
+        result["orders"] = [spot_resp, perp_resp]
+        result["spot_qty"] = str(spot_qty)
+        result["perp_qty"] = str(perp_qty)
+        result["spot_px"] = str(spot_px)
+        result["perp_px"] = str(perp_px)
+        result["spot_best"] = {"bid": str(sbid), "ask": str(sask)}
+        result["perp_best"] = {"bid": str(pbid), "ask": str(pask)}
+        result["spot_filled_usd"] = str(spot_filled_usd)
+        result["perp_filled_usd"] = str(perp_filled_usd)
+        result["spot_filled_sz"] = str(spot_filled_sz)
+        result["perp_filled_sz"] = str(perp_filled_sz)
+        result["spot_filled_avg_px"] = str(spot_filled_avg)
+        result["perp_filled_avg_px"] = str(perp_filled_avg)
+        if spot_oid is not None:
+            result["spot_oid"] = spot_oid
+        if perp_oid is not None:
+            result["perp_oid"] = perp_oid
         return result
 
 
@@ -4,29 +4,20 @@ from dataclasses import dataclass
 from decimal import Decimal
 from typing import Tuple
 
-from src.exchanges.base_gateway import ExchangeGateway
+from src.core.num import TWO, ZERO, quantize_size
+from src.exchanges.base_gateway import ExchangeGateway, top_of_book
 
 
-@dataclass
+@dataclass(slots=True)
 class HedgeParams:
     target_usd_notional: Decimal
     hedge_ratio: Decimal
 
 
-def _quantize_size(qty: Decimal, size_decimals: int) -> Decimal:
-    quantum = Decimal(1).scaleb(-size_decimals)
-    return (qty // quantum) * quantum
-
-
 def _mid_price(gw: ExchangeGateway, symbol: str) -> Decimal:
-    l2 = gw.get_l2(symbol)
-    levels = l2.get("levels") or []
-    bids = levels[0] if len(levels) > 0 else []
-    asks = levels[1] if len(levels) > 1 else []
-    bid = Decimal(str(bids[0]["px"])) if bids else Decimal("0")
-    ask = Decimal(str(asks[0]["px"])) if asks else Decimal("0")
+    bid, ask = top_of_book(gw.get_l2(symbol))
     if ask > 0:
-        return (bid + ask) / Decimal(2)
+        return (bid + ask) / TWO
     return bid
 
 
@@ -35,10 +26,10 @@ def compute_hedge_sizes(spot: ExchangeGateway, perp: ExchangeGateway, spot_symbo
     perp_meta = perp.get_symbol_meta(perp_symbol)
     spot_mid = _mid_price(spot, spot_symbol)
     if spot_mid <= 0:
-        return Decimal("0"), Decimal("0")
+        return ZERO, ZERO
     base_qty = (params.target_usd_notional / spot_mid) * params.hedge_ratio
-    spot_qty = _quantize_size(base_qty, spot_meta.size_decimals)
-    perp_qty = _quantize_size(base_qty, perp_meta.size_decimals)
+    spot_qty = quantize_size(base_qty, spot_meta.size_decimals)
+    perp_qty = quantize_size(base_qty, perp_meta.size_decimals)
     return spot_qty, perp_qty
 
 
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class RebalanceDecision:
     spot_delta: Decimal
     perp_delta: Decimal
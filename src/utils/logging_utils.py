@@ -1,11 +1,147 @@
 from __future__ import annotations
 
+import atexit
+import heapq
 import json
 import logging
 import os
+import queue
+import sys
+import threading
 import time
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, Optional
+from collections import OrderedDict, defaultdict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, DefaultDict, Dict, Iterator, Optional
+
+
+# Userspace buffer for log files: the listener thread flushes it when its queue runs dry (or on ERROR),
+# so a burst of records is one write() per 64 KiB instead of one per record
+_FILE_BUFFER_BYTES = 64 * 1024
+
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    # RotatingFileHandler without the per-record flush. The stock rollover check also seeks the stream (which
+    # flushes it) and formats the record a second time; here the file size is tracked as records are written.
+    def _open(self):  # type: ignore[override]
+        stream = self._builtin_open(
+            self.baseFilename, self.mode, buffering=_FILE_BUFFER_BYTES, encoding=self.encoding, errors=self.errors
+        )
+        stream.seek(0, 2)
+        self._size = stream.tell()
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # Character count, like the stock check; the stock check also skips non-regular files (e.g. /dev/null)
+            if self.maxBytes > 0 and self._size + len(msg) >= self.maxBytes and os.path.isfile(self.baseFilename):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += len(msg)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+# Longest an ERROR call blocks for the background write; bounded so a listener that stops mid-wait cannot hang it
+_ERROR_WRITE_TIMEOUT_S = 5.0
+
+
+class _FileListener(QueueListener):
+    # Flushes its handlers once the queue is drained, and after every ERROR so it is on disk before the
+    # producer's wait returns. `running` is our own liveness flag, cleared before the thread is told to stop.
+    running = False
+
+    def start(self) -> None:
+        super().start()
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+        super().stop()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if record.levelno >= logging.ERROR:
+            for h in self.handlers:
+                h.flush()
+            written = record.__dict__.get("_written")
+            if written is not None:
+                written.set()
+        elif self.queue.empty():
+            for h in self.handlers:
+                h.flush()
+
+
+class _QueueFileHandler(QueueHandler):
+    # Producer side of a background file writer: a log call is a queue put, the listener thread does the write.
+    # ERROR and above wait (bounded) until the record is on disk; the queue is FIFO, so everything logged before
+    # it is too, and the records leading up to a failure are not left in memory if the process dies next. Once
+    # the listener is stopped (interpreter exit), records are written inline.
+    def __init__(self, q: "queue.SimpleQueue[Any]", listener: _FileListener) -> None:
+        super().__init__(q)
+        self.listener = listener
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if not self.listener.running:
+            self.listener.handle(record)
+            return
+        if record.levelno < logging.ERROR:
+            self.queue.put_nowait(record)
+            return
+        # record is prepare()'s copy, so the marker never reaches other handlers
+        written = record._written = threading.Event()
+        self.queue.put_nowait(record)
+        written.wait(_ERROR_WRITE_TIMEOUT_S)
+
+
+# logger name -> its background file writer; one RotatingFileHandler and thread per logger for the process
+_LISTENERS: Dict[str, _FileListener] = {}
+_QUEUE_HANDLERS: Dict[str, _QueueFileHandler] = {}
+
+
+def _stop_listeners() -> None:
+    for listener in _LISTENERS.values():
+        if listener.running:
+            listener.stop()
+
+
+atexit.register(_stop_listeners)
+
+# Stateless once built, so every handler shares one instead of re-parsing the format per setup call
+_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_LEVEL_MAP: Dict[str, int] = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARN,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+
+class _LogEnv:
+    # Logging overrides from the environment, read once at import; assign a fresh _LogEnv() to pick up changes
+    __slots__ = ("level", "file", "max_bytes", "backup_count", "disable_console")
+
+    def __init__(self) -> None:
+        env = os.environ
+        self.level = env.get("LOG_LEVEL")
+        self.file = env.get("LOG_FILE")
+        self.max_bytes = env.get("LOG_MAX_BYTES")
+        self.backup_count = env.get("LOG_BACKUP_COUNT")
+        self.disable_console = env.get("DISABLE_CONSOLE_LOGGING")
+
+
+_LOG_ENV = _LogEnv()
 
 
 def setup_app_logger(logger_name: str,
@@ -15,74 +151,77 @@ def setup_app_logger(logger_name: str,
                      log_max_bytes: Optional[int] = None,
                      log_backup_count: Optional[int] = None,
                      disable_console_logging: Optional[bool] = None) -> Dict[str, Any]:
-    level_str = os.environ.get("LOG_LEVEL", log_level or "INFO")
-    try:
-        level = getattr(logging, level_str.upper(), logging.INFO)
-    except Exception:
-        level = logging.INFO
-
-    file_path = os.environ.get("LOG_FILE", log_file or f"logs/{logger_name}.log")
-    try:
-        d = os.path.dirname(file_path)
-        if d:
+    env = _LOG_ENV
+    level_str = env.level or log_level or "INFO"
+    # Canonical names ("INFO") hit directly; only other spellings pay for upper()
+    level = _LEVEL_MAP.get(level_str)
+    if level is None:
+        level = _LEVEL_MAP.get(level_str.upper(), logging.INFO)
+
+    file_path = env.file or log_file or f"logs/{logger_name}.log"
+    d = os.path.dirname(file_path)
+    # One stat in the usual case where the directory already exists
+    if d and not os.path.isdir(d):
+        try:
             os.makedirs(d, exist_ok=True)
-    except Exception:
-        pass
+        except OSError:
+            pass
 
     max_bytes = 10 * 1024 * 1024 if log_max_bytes is None else int(log_max_bytes)
     backup_count = 5 if log_backup_count is None else int(log_backup_count)
-    try:
-        max_bytes = int(os.environ.get("LOG_MAX_BYTES", str(max_bytes)))
-    except Exception:
-        pass
-    try:
-        backup_count = int(os.environ.get("LOG_BACKUP_COUNT", str(backup_count)))
-    except Exception:
-        pass
-
-    env_disable = os.environ.get("DISABLE_CONSOLE_LOGGING")
-    if env_disable is not None:
-        disable_console = env_disable == "1"
+    if env.max_bytes is not None:
+        try:
+            max_bytes = int(env.max_bytes)
+        except ValueError:
+            pass
+    if env.backup_count is not None:
+        try:
+            backup_count = int(env.backup_count)
+        except ValueError:
+            pass
+
+    if env.disable_console is not None:
+        disable_console = env.disable_console == "1"
     else:
         disable_console = bool(disable_console_logging) if disable_console_logging is not None else False
 
     logger = logging.getLogger(logger_name)
-    try:
-        logger.setLevel(level)
-    except Exception:
-        pass
-
-    fmt = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-    try:
-        has_file = False
-        for h in list(logger.handlers):
-            if isinstance(h, RotatingFileHandler):
-                has_file = True
-                try:
-                    h.setFormatter(fmt)
-                except Exception:
-                    pass
-            if disable_console and isinstance(h, logging.StreamHandler):
-                try:
-                    logger.removeHandler(h)
-                except Exception:
-                    pass
-            elif isinstance(h, logging.StreamHandler):
-                try:
-                    h.setFormatter(fmt)
-                except Exception:
-                    pass
-
-        if not has_file:
-            fh = RotatingFileHandler(file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    logger.setLevel(level)
+
+    fmt = _FMT
+
+    if disable_console:
+        # Console handlers only: file handlers subclass StreamHandler but are not console output.
+        # A copy is only taken when something is removed.
+        for h in [h for h in logger.handlers if type(h) is logging.StreamHandler]:
+            logger.removeHandler(h)
+    for h in logger.handlers:
+        if isinstance(h, logging.StreamHandler):
+            h.setFormatter(fmt)
+
+    qh = _QUEUE_HANDLERS.get(logger_name)
+    if qh is None:
+        try:
+            fh = _BufferedRotatingFileHandler(
+                file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        except OSError:
+            fh = None  # unwritable path: run without a file log, as before
+        if fh is not None:
             fh.setLevel(level)
             fh.setFormatter(fmt)
-            logger.addHandler(fh)
-
-        logger.propagate = False
-    except Exception:
-        pass
+            # SimpleQueue: nothing join()s it (ERROR records wait on their own Event), so no task_done bookkeeping
+            q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+            listener = _FileListener(q, fh, respect_handler_level=True)
+            listener.start()
+            qh = _QueueFileHandler(q, listener)
+            qh.setLevel(level)
+            _LISTENERS[logger_name] = listener
+            _QUEUE_HANDLERS[logger_name] = qh
+    if qh is not None and qh not in logger.handlers:
+        logger.addHandler(qh)
+
+    logger.propagate = False
 
     return {
         "file": file_path,
@@ -93,24 +232,51 @@ def setup_app_logger(logger_name: str,
     }
 
 
+# Per-type state RateLimitedLogger keeps before evicting the oldest entry
+_MAX_LOG_TYPES = 4096
+
+
 class RateLimitedLogger:
     def __init__(self, min_interval_seconds: Optional[Dict[str, int]] = None) -> None:
-        self.last_log_times: Dict[str, float] = {}
-        self.min_intervals = min_interval_seconds or {
-            "default": 60,
-            "price_update": 300,
-            "connection": 60,
-            "api_call": 60,
-            "heartbeat": 300,
-            "websocket": 120,
+        # Least recently logged first; bounded so per-symbol or otherwise unbounded log types cannot leak.
+        # An evicted type just logs again on its next call.
+        self.last_log_times: "OrderedDict[str, float]" = OrderedDict()
+        # Keys interned once here rather than per should_log() call: interning costs more than the lookup it speeds up
+        self.min_intervals = {
+            sys.intern(k): v
+            for k, v in (
+                min_interval_seconds
+                or {
+                    "default": 60,
+                    "price_update": 300,
+                    "connection": 60,
+                    "api_call": 60,
+                    "heartbeat": 300,
+                    "websocket": 120,
+                }
+            ).items()
         }
+        # log_type -> its interval with the "default" fallback applied; min_intervals is fixed after construction
+        self._resolved_intervals: Dict[str, float] = {}
 
     def should_log(self, log_type: str) -> bool:
-        now = time.time()
-        last_time = self.last_log_times.get(log_type, 0.0)
-        interval = self.min_intervals.get(log_type, self.min_intervals["default"])
-        if now - last_time >= interval:
-            self.last_log_times[log_type] = now
+        # Monotonic: a wall-clock step (NTP, VM resume) must neither burst nor mute a log type
+        now = time.monotonic()
+        interval = self._resolved_intervals.get(log_type)
+        if interval is None:
+            # First sighting of this type: store it under an interned key so later equal strings hit by identity
+            log_type = sys.intern(log_type)
+            resolved = self._resolved_intervals
+            if len(resolved) >= _MAX_LOG_TYPES:
+                del resolved[next(iter(resolved))]
+            interval = resolved[log_type] = self.min_intervals.get(log_type, self.min_intervals["default"])
+        last_time = self.last_log_times.get(log_type)
+        if last_time is None or now - last_time >= interval:
+            times = self.last_log_times
+            times[log_type] = now
+            times.move_to_end(log_type)
+            if len(times) > _MAX_LOG_TYPES:
+                times.popitem(last=False)
             return True
         return False
 
@@ -124,98 +290,140 @@ class LogSummarizer:
     def __init__(self, logger: logging.Logger, interval_seconds: int = 300) -> None:
         self.logger = logger
         self.interval = interval_seconds
-        self.last_summary_time = time.time()
-        self.price_updates: Dict[str, list[tuple[float, float, float]]] = {}
+        # Monotonic; each record_* reads the clock once for the interval check (and the stored funding
+        # timestamp, which is never displayed)
+        self.last_summary_time = time.monotonic()
+        # key -> [first old price, last new price, update count], folded as updates arrive
+        self.price_updates: Dict[str, list[float]] = {}
         self.funding_updates: Dict[str, tuple[float, float]] = {}
+        # key -> (exchange, symbol) for display, cleared with the counts on each summary so it only holds keys
+        # seen this interval; a split on "_" would break on symbols with "_"
+        self._key_parts: Dict[str, tuple[str, str]] = {}
         self.api_calls = {"success": 0, "failed": 0}
-        self.errors: Dict[str, int] = {}
+        self.errors: DefaultDict[str, int] = defaultdict(int)
         self.connection_events = {"connect": 0, "disconnect": 0}
+        # record_* may be called from several websocket threads: every fold, and the interval check that decides
+        # which caller emits the summary, runs under this lock (_check_summary/_generate_summary expect it held)
+        self._lock = threading.Lock()
 
-    def _check_summary(self) -> None:
-        now = time.time()
-        if now - self.last_summary_time >= self.interval:
-            self._generate_summary()
-            self.last_summary_time = now
+    def _check_summary(self, now: float) -> None:
+        if now - self.last_summary_time < self.interval:
+            return
+        self._generate_summary()
+        self.last_summary_time = now
 
     def record_price_update(self, symbol: str, exchange: str, old_price: float, new_price: float) -> None:
+        # Nothing is recorded while its summary line could not be emitted (errors log at WARNING, the rest at INFO)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        now = time.monotonic()
         key = f"{exchange}_{symbol}"
-        self.price_updates.setdefault(key, []).append((old_price, new_price, time.time()))
-        self._check_summary()
+        with self._lock:
+            slot = self.price_updates.get(key)
+            if slot is None:
+                self.price_updates[key] = [old_price, new_price, 1]
+                if key not in self._key_parts:
+                    self._key_parts[key] = (exchange, symbol)
+            else:
+                slot[1] = new_price
+                slot[2] += 1
+            self._check_summary(now)
 
     def record_funding_update(self, symbol: str, exchange: str, rate: float) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        now = time.monotonic()
         key = f"{exchange}_{symbol}"
-        self.funding_updates[key] = (rate, time.time())
-        self._check_summary()
+        with self._lock:
+            if key not in self._key_parts:
+                self._key_parts[key] = (exchange, symbol)
+            self.funding_updates[key] = (rate, now)
+            self._check_summary(now)
 
     def record_api_call(self, success: bool = True) -> None:
-        if success:
-            self.api_calls["success"] += 1
-        else:
-            self.api_calls["failed"] += 1
-        self._check_summary()
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        with self._lock:
+            if success:
+                self.api_calls["success"] += 1
+            else:
+                self.api_calls["failed"] += 1
+            self._check_summary(time.monotonic())
 
     def record_error(self, error_type: str) -> None:
-        self.errors[error_type] = self.errors.get(error_type, 0) + 1
-        self._check_summary()
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        with self._lock:
+            self.errors[error_type] += 1
+            self._check_summary(time.monotonic())
 
     def record_connection_event(self, event_type: str) -> None:
-        if event_type in self.connection_events:
-            self.connection_events[event_type] += 1
-        self._check_summary()
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        with self._lock:
+            if event_type in self.connection_events:
+                self.connection_events[event_type] += 1
+            self._check_summary(time.monotonic())
 
     def _generate_summary(self) -> None:
         if self.price_updates:
-            significant = []
-            for key, updates in self.price_updates.items():
-                if not updates:
-                    continue
-                first = updates[0][0] or 0
-                last = updates[-1][1]
-                cnt = len(updates)
-                if first > 0:
-                    change_pct = ((last - first) / first) * 100
-                    if abs(change_pct) > 0.5 or cnt > 10:
-                        significant.append((key, first, last, change_pct, cnt))
-            significant.sort(key=lambda x: abs(x[3]), reverse=True)
-            top = significant[:5]
+            key_parts = self._key_parts
+            n_significant = 0
+
+            def significant() -> Iterator[tuple]:
+                # Filter fused into the top-k selection: only the 5 kept rows are ever held at once
+                nonlocal n_significant
+                for key, (first, last, cnt) in self.price_updates.items():
+                    first = first or 0
+                    if first > 0:
+                        change_pct = ((last - first) / first) * 100
+                        if abs(change_pct) > 0.5 or cnt > 10:
+                            n_significant += 1
+                            # Ranked by the leading (|pct|, -arrival) pair, so plain tuple comparison needs no key
+                            # function and ties keep arrival order, as the stable sort did
+                            yield abs(change_pct), -n_significant, key_parts[key], first, last, change_pct, cnt
+
+            top = heapq.nlargest(5, significant())
             if top:
-                parts = []
-                for key, first, last, pct, cnt in top:
-                    ex, sym = key.split("_")
-                    parts.append(f"{ex}/{sym}: {first:.2f}\u2192{last:.2f} ({pct:+.2f}%, {cnt})")
-                more = len(significant) - len(top)
+                parts = [
+                    f"{ex}/{sym}: {first:.2f}\u2192{last:.2f} ({pct:+.2f}%, {cnt})"
+                    for _abs, _order, (ex, sym), first, last, pct, cnt in top
+                ]
+                more = n_significant - len(top)
                 more_text = f" and {more} more" if more > 0 else ""
-                self.logger.info(f"Price changes: {', '.join(parts)}{more_text}")
+                self.logger.info("Price changes: %s%s", ", ".join(parts), more_text)
 
         if self.funding_updates:
-            items = sorted(self.funding_updates.items(), key=lambda x: abs(x[1][0]), reverse=True)[:5]
-            parts = []
-            for key, (rate, _) in items:
-                ex, sym = key.split("_")
-                parts.append(f"{ex}/{sym}: {rate:+.6f}")
+            items = heapq.nlargest(5, self.funding_updates.items(), key=lambda x: abs(x[1][0]))
+            key_parts = self._key_parts
+            parts = [f"{'/'.join(key_parts[key])}: {rate:+.6f}" for key, (rate, _) in items]
             more = len(self.funding_updates) - len(items)
             more_text = f" and {more} more" if more > 0 else ""
-            if parts:
-                self.logger.info(f"Funding updates: {', '.join(parts)}{more_text}")
+            # funding_updates is non-empty here, so parts is too
+            self.logger.info("Funding updates: %s%s", ", ".join(parts), more_text)
 
         if self.api_calls["success"] > 0 or self.api_calls["failed"] > 0:
-            self.logger.info(f"API calls: ok {self.api_calls['success']}, failed {self.api_calls['failed']}")
-            self.api_calls = {"success": 0, "failed": 0}
+            self.logger.info("API calls: ok %d, failed %d", self.api_calls["success"], self.api_calls["failed"])
+            self.api_calls["success"] = self.api_calls["failed"] = 0
 
         if self.errors:
             joined = ", ".join(f"{k}: {v}" for k, v in self.errors.items())
-            self.logger.warning(f"Errors: {joined}")
-            self.errors = {}
+            self.logger.warning("Errors: %s", joined)
+            self.errors.clear()
 
         if self.connection_events["connect"] > 0 or self.connection_events["disconnect"] > 0:
-            self.logger.info(f"Connections: up {self.connection_events['connect']}, down {self.connection_events['disconnect']}")
-            self.connection_events = {"connect": 0, "disconnect": 0}
+            self.logger.info(
+                "Connections: up %d, down %d", self.connection_events["connect"], self.connection_events["disconnect"]
+            )
+            self.connection_events["connect"] = self.connection_events["disconnect"] = 0
 
         self.price_updates = {}
         self.funding_updates = {}
+        self._key_parts = {}
 
     def force_summary(self) -> None:
-        self._generate_summary()
-        self.last_summary_time = time.time()
+        with self._lock:
+            self._generate_summary()
+            self.last_summary_time = time.monotonic()
 
 
@@ -5,9 +5,12 @@ from decimal import Decimal
 
 from src.core.clock import TimeProvider
 from src.core.config import load_config
+from src.core.logging import JsonLogger
 from src.core.metrics import Metrics
+from src.core.num import quantize_size, to_dec
 from src.core.persistence import Event, StateStore
 from src.core.types import Order, Position
+from src.utils.logging_utils import LogSummarizer, RateLimitedLogger, setup_app_logger
 
 
 def test_clock_now_and_sleep():
@@ -16,6 +19,33 @@ def test_clock_now_and_sleep():
     assert isinstance(t0, float)
 
 
+def test_clock_monotonic_independent_of_wall_clock():
+    tp = TimeProvider(now_fn=lambda: 0.0, monotonic_fn=lambda: 42.0)
+    assert tp.monotonic() == 42.0 and tp.now() == 0.0
+
+
+def test_json_logger_emitter_survives_unformattable_field():
+    import logging
+
+    class Unprintable:
+        def __str__(self):
+            raise RuntimeError("no str")
+
+    lines = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            lines.append(record.getMessage())
+
+    jl = JsonLogger(name="test_json_logger_emitter")
+    jl._logger.addHandler(Collect())
+    emit = jl.make_emitter("progress", ("a", "b"))
+    emit(1, Decimal("2.5"))
+    emit(1, Unprintable())  # falls back to the bare message, like log()
+    jl.info("progress", a=Unprintable())
+    assert lines == ["progress a=1 b=2.5", "progress", "progress"]
+
+
 def test_config_loads_from_example(tmp_path):
     example = {
         "credentials": {"account_address": "0x1", "secret_key": "0x2", "base_url": "https://api"},
@@ -30,6 +60,13 @@ def test_config_loads_from_example(tmp_path):
     cfg = load_config(str(path))
     assert cfg.strategy.enter_threshold_apr == Decimal("0.1")
     assert cfg.markets["spot"] == "ASTER/USDT"
+    assert cfg.alignment.interval_s == 30.0
+    assert load_config(str(path)) is cfg
+    example["strategy"]["target_usd_notional"] = 250.0
+    path.write_text(json.dumps(example))
+    updated = load_config(str(path))
+    assert updated.strategy.target_usd_notional == Decimal("250.0")
+    assert updated != cfg and len({cfg, updated}) == 2
 
 
 def test_metrics_counter_and_gauge():
@@ -43,6 +80,20 @@ def test_metrics_counter_and_gauge():
     assert g.value == 1.5
 
 
+def test_num_to_dec_shares_parsed_prices():
+    assert to_dec("101.25") == Decimal("101.25")
+    assert to_dec("101.25") is to_dec("101.25")
+    assert to_dec(0.1) == Decimal("0.1")
+    d = Decimal("3")
+    assert to_dec(d) is d
+
+
+def test_num_quantize_size_floors_to_lots():
+    assert quantize_size(Decimal("4.999"), 2) == Decimal("4.99")
+    assert quantize_size(Decimal("7"), 0) == Decimal("7")
+    assert quantize_size(Decimal("0.0009"), 3) == Decimal("0")
+
+
 def test_persistence_kv_and_events(tmp_path):
     db = tmp_path / "state.db"
     store = StateStore(str(db))
@@ -61,3 +112,84 @@ def test_types_dataclasses():
     assert o.symbol == "ASTER" and p.base == Decimal("1")
 
 
+def test_persistence_append_events_batch(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    store.append_events([])
+    store.append_events([Event(ts=1.0, kind="fee", data={"spot_fee": Decimal("0.1")}), Event(ts=1.0, kind="entry", data={"entered": True})])
+    got = list(store.iter_events())
+    assert [e.kind for e in got] == ["fee", "entry"] and got[0].data["spot_fee"] == "0.1"
+    store.close()
+
+
+def test_persistence_transaction_commits_once_and_rolls_back(tmp_path):
+    db = tmp_path / "state.db"
+    store = StateStore(str(db))
+    with store.transaction():
+        store.append_event(Event(ts=1.0, kind="fee", data={"spot_fee": "0.1"}))
+        store.append_event(Event(ts=1.0, kind="entry", data={"entered": True}))
+    try:
+        with store.transaction():
+            store.append_event(Event(ts=2.0, kind="entry", data={"entered": True}))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    store.close()
+    reopened = StateStore(str(db))
+    assert [e.kind for e in reopened.iter_events()] == ["fee", "entry"]
+    reopened.close()
+
+
+def test_app_logger_writes_file_from_background_queue(tmp_path, monkeypatch):
+    import logging
+
+    from src.utils import logging_utils
+
+    monkeypatch.delenv("LOG_FILE", raising=False)
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    monkeypatch.setattr(logging_utils, "_LOG_ENV", logging_utils._LogEnv())
+    path = tmp_path / "app.log"
+    setup_app_logger("test_app_logger_queue", log_file=str(path), disable_console_logging=True)
+    setup_app_logger("test_app_logger_queue", log_file=str(path), disable_console_logging=True)
+    logger = logging.getLogger("test_app_logger_queue")
+    assert len(logger.handlers) == 1  # one queue handler, no per-call duplicates
+    logger.info("first")
+    logger.error("second")  # returns once everything queued so far is written
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.rsplit(" - ", 1)[1] for line in lines] == ["first", "second"]
+
+
+def test_rate_limited_logger_first_event_logs_then_throttles():
+    rl = RateLimitedLogger({"default": 60, "fast": 0})
+    assert rl.should_log("default") is True  # first event of a type always logs, whatever the clock origin
+    assert rl.should_log("default") is False
+    assert rl.should_log("fast") is True and rl.should_log("fast") is True
+
+
+def test_log_summarizer_folds_price_updates(caplog):
+    import logging
+
+    logger = logging.getLogger("test_log_summarizer")
+    logger.setLevel(logging.INFO)
+    summarizer = LogSummarizer(logger, interval_seconds=3600)
+    for i in range(3):
+        summarizer.record_price_update("ASTER", "hl", 10.0 + i, 11.0 + i)
+    assert summarizer.price_updates == {"hl_ASTER": [10.0, 13.0, 3]}
+    with caplog.at_level(logging.INFO, logger="test_log_summarizer"):
+        summarizer.force_summary()
+    assert "hl/ASTER: 10.00\u219213.00 (+30.00%, 3)" in caplog.text
+    assert summarizer.price_updates == {} and summarizer._key_parts == {}  # display names do not accumulate
+
+
+def test_log_summarizer_skips_recording_above_info():
+    import logging
+
+    logger = logging.getLogger("test_log_summarizer_quiet")
+    logger.setLevel(logging.ERROR)
+    summarizer = LogSummarizer(logger, interval_seconds=3600)
+    summarizer.record_price_update("ASTER", "hl", 10.0, 11.0)
+    summarizer.record_error("timeout")
+    assert summarizer.price_updates == {} and summarizer.errors == {}
+    logger.setLevel(logging.INFO)  # applies to the very next record
+    summarizer.record_error("timeout")
+    assert summarizer.errors == {"timeout": 1}
+
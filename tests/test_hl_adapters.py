@@ -2,8 +2,10 @@ from decimal import Decimal
 
 import pytest
 
+from src.exchanges.base_gateway import OrderSpec
 from src.exchanges.hyperliquid.hl_spot_adapter import HyperliquidSpotAdapter
 from src.exchanges.hyperliquid.hl_perp_adapter import HyperliquidPerpAdapter
+from src.strategy.funding_carry import FundingCarryStrategy, StrategyConfig
 
 
 class FakeInfo:
@@ -70,6 +72,8 @@ def test_spot_meta_and_order_flow(fakes):
     assert meta.kind == "spot"
     assert meta.tick > Decimal("0")
 
+    assert spot.get_symbol_meta(symbol) is meta  # reused, no second L2 read for the tick
+
     l2 = spot.get_l2(symbol)
     assert "levels" in l2
 
@@ -99,3 +103,119 @@ def test_perp_meta_funding_and_order_flow(fakes):
     assert cancel["status"] == "ok"
 
 
+def test_perp_sets_leverage_once_per_symbol(fakes):
+    address, info, ex = fakes
+    calls = []
+    ex.configure_leverage = lambda symbol, leverage: calls.append((symbol, leverage))
+    perp = HyperliquidPerpAdapter(address, info, ex)
+    perp.place_order("ASTER", "SELL", Decimal("1"), Decimal("10.02"))
+    perp.place_order("ASTER", "BUY", Decimal("1"), Decimal("10.00"))
+    assert calls == [("ASTER", 1)]
+    assert len(ex.placed) == 2
+
+
+def test_perp_funding_follows_universe_changes(fakes):
+    address, info, ex = fakes
+    perp = HyperliquidPerpAdapter(address, info, ex)
+    assert perp.get_funding("ASTER")["funding"] == "0.0001"
+    info.meta_and_asset_ctxs = lambda: [
+        {"universe": [{"name": "BTC"}, {"name": "ASTER"}]},
+        [{"funding": "0.0003", "markPx": "60000"}, {"funding": "0.0002", "markPx": "10.01"}],
+    ]
+    assert perp.get_funding("ASTER")["funding"] == "0.0002"
+    assert perp.get_funding("ETH")["funding"] is None
+
+
+def test_perp_l2_prefers_fresh_websocket_book(fakes):
+    address, info, ex = fakes
+    subs = []
+    info.ws_manager = object()
+    info.subscribe = lambda sub, cb: subs.append((sub, cb))
+    perp = HyperliquidPerpAdapter(address, info, ex)
+    assert perp.best_bid_ask("ASTER") == (Decimal("10.0"), Decimal("10.02"))  # REST until a push arrives
+    assert [s for s, _ in subs] == [{"type": "l2Book", "coin": "ASTER"}]
+    subs[0][1]({"channel": "l2Book", "data": {"coin": "ASTER", "levels": [[{"px": "10.01"}], [{"px": "10.03"}]]}})
+    assert perp.best_bid_ask("ASTER") == (Decimal("10.01"), Decimal("10.03"))
+    perp._l2.staleness_s = -1.0  # every pushed book now counts as stale
+    assert perp.best_bid_ask("ASTER") == (Decimal("10.0"), Decimal("10.02"))
+    assert len(subs) == 1
+
+
+def test_spot_place_orders_batches_both_legs(fakes):
+    address, info, ex = fakes
+    bulks = []
+
+    def bulk_orders(requests):
+        bulks.append(requests)
+        return {
+            "status": "ok",
+            "response": {"type": "order", "data": {"statuses": [{"resting": {"oid": 5}}, {"error": "rejected"}]}},
+        }
+
+    ex.bulk_orders = bulk_orders
+    spot = HyperliquidSpotAdapter(address, info, ex)
+    spot_resp, perp_resp = spot.place_orders(
+        [
+            OrderSpec("ASTER/USDT", "BUY", Decimal("1"), Decimal("10.00"), post_only=True),
+            OrderSpec("ASTER", "SELL", Decimal("1"), Decimal("10.02")),
+        ]
+    )
+    assert len(bulks) == 1 and ex.placed == []
+    assert bulks[0][0]["order_type"] == {"limit": {"tif": "Gtc", "postOnly": True}}
+    assert [(r["coin"], r["is_buy"], r["sz"], r["limit_px"]) for r in bulks[0]] == [
+        ("ASTER/USDT", True, 1.0, 10.0),
+        ("ASTER", False, 1.0, 10.02),
+    ]
+    assert spot_resp["response"]["data"]["statuses"] == [{"resting": {"oid": 5}}]
+    assert perp_resp["response"]["data"]["statuses"] == [{"error": "rejected"}]
+
+    del ex.bulk_orders  # SDKs without the bulk endpoint get one order() per spec
+    assert len(spot.place_orders([OrderSpec("ASTER/USDT", "BUY", Decimal("1"), Decimal("10.00"))])) == 1
+    assert len(ex.placed) == 1
+
+
+def test_batched_entry_spot_reject_reports_perp_fill(fakes):
+    address, info, ex = fakes
+    info.spot_user_state = lambda a: {"balances": [{"coin": "USDT", "total": "1000"}]}
+    ex.bulk_orders = lambda requests: {
+        "status": "ok",
+        "response": {
+            "type": "order",
+            "data": {"statuses": [{"error": "Post only order would have immediately matched"},
+                                  {"filled": {"totalSz": "4.99", "avgPx": "10.01", "oid": 6}}]},
+        },
+    }
+    strat = FundingCarryStrategy(
+        HyperliquidSpotAdapter(address, info, ex),
+        HyperliquidPerpAdapter(address, info, ex),
+        "ASTER/USDT",
+        "ASTER",
+        StrategyConfig(Decimal("0"), Decimal("0"), Decimal("50")),
+    )
+    result = strat.evaluate_and_place()
+    # The naked perp fill is reported as an entry with no spot fill, which is what starts the runner's hedge repair
+    assert result["entered"] is True
+    assert result["perp_filled_sz"] == "4.99" and result["spot_filled_sz"] == "0"
+    assert "spot_oid" not in result and ex.placed == []
+
+
+def test_batched_entry_sets_perp_leverage_first(fakes):
+    address, info, ex = fakes
+    calls = []
+    info.spot_user_state = lambda a: {"balances": [{"coin": "USDT", "total": "1000"}]}
+    ex.configure_leverage = lambda symbol, leverage: calls.append((symbol, leverage))
+    ex.bulk_orders = lambda requests: calls.append("bulk") or {
+        "status": "ok",
+        "response": {"type": "order", "data": {"statuses": [{"resting": {"oid": 5}}, {"resting": {"oid": 6}}]}},
+    }
+    strat = FundingCarryStrategy(
+        HyperliquidSpotAdapter(address, info, ex),
+        HyperliquidPerpAdapter(address, info, ex),
+        "ASTER/USDT",
+        "ASTER",
+        StrategyConfig(Decimal("0"), Decimal("0"), Decimal("50")),
+    )
+    strat.evaluate_and_place()
+    # The perp leg rides the spot adapter's batch; its 1x leverage setup still precedes the first send
+    assert calls == [("ASTER", 1), "bulk"]
+
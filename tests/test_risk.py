@@ -11,6 +11,10 @@ def test_notional_limiter_caps():
     nl.apply("ASTER", Decimal("200"))
     assert not nl.can_add("ASTER", Decimal("400"))  # per-symbol cap breach
     assert nl.can_add("B", Decimal("800")) is False  # portfolio cap breach
+    nl.apply("ASTER", Decimal("-300"))  # clamps at zero, freeing the whole 200
+    nl.apply("B", Decimal("500"))
+    nl.apply("C", Decimal("500"))
+    assert not nl.can_add("D", Decimal("1"))  # portfolio now exactly at cap
 
 
 def test_order_rate_limiter():
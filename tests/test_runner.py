@@ -0,0 +1,81 @@
+import json
+
+from src.app.runner import RunnerOptions, StrategyRunner
+from src.core.config import load_config
+from src.core.persistence import Event, StateStore
+from src.utils import logging_utils
+
+
+def _runner(tmp_path, monkeypatch, cls=StrategyRunner):
+    example = {
+        "credentials": {"account_address": "0x1", "secret_key": "0x2", "base_url": "https://api"},
+        "markets": {"base": "ASTER", "spot": "ASTER/USDT", "perp": "ASTER"},
+        "strategy": {"enter_threshold_apr": 0.1, "exit_threshold_apr": 0.04, "target_usd_notional": 200.0, "hedge_ratio": 1.0},
+        "execution": {"price_offset_ticks": 1, "tif": "Gtc", "post_only": True, "reprice_interval_ms": 800, "max_replaces_per_min": 20},
+        "risk": {"per_symbol_notional_cap": 500.0, "portfolio_notional_cap": 2000.0, "max_drawdown_usd": 50.0, "min_spread_ticks": 1},
+        "telemetry": {"log_level": "INFO", "log_file": str(tmp_path / "runner.log"), "disable_console_logging": True},
+    }
+    path = tmp_path / "cfg.json"
+    path.write_text(json.dumps(example))
+    monkeypatch.delenv("LOG_FILE", raising=False)
+    monkeypatch.setattr(logging_utils, "_LOG_ENV", logging_utils._LogEnv())
+    db = tmp_path / "state.db"
+    runner = cls(load_config(str(path)), RunnerOptions(config_path=str(path), dry_run=True, once=True, state_db=str(db)))
+    runner.clock.sleep_fn = lambda s: None
+    return runner, db
+
+
+def _kinds(db):
+    store = StateStore(str(db))
+    try:
+        return [e.kind for e in store.iter_events()]
+    finally:
+        store.close()
+
+
+def test_runner_flush_events_writes_buffer_as_one_batch(tmp_path, monkeypatch):
+    runner, db = _runner(tmp_path, monkeypatch)
+    runner._event_buf.append(Event(ts=1.0, kind="fee", data={"spot_fee": "0.1"}))
+    runner._event_buf.append(Event(ts=1.0, kind="entry", data={"entered": True}))
+    runner._flush_events()
+    assert runner._event_buf == []
+    runner._flush_events()  # nothing buffered: no write
+    runner.state.close()
+    assert _kinds(db) == ["fee", "entry"]
+
+
+class _FailingPerpCloseRunner(StrategyRunner):
+    closed_spot = False
+
+    def _close_perp(self) -> None:
+        raise OSError("venue down")
+
+    def _close_spot(self) -> None:
+        self.closed_spot = True
+
+
+def test_runner_shutdown_runs_every_step_when_a_close_fails(tmp_path, monkeypatch):
+    runner, db = _runner(tmp_path, monkeypatch, _FailingPerpCloseRunner)
+    runner._event_buf.append(Event(ts=1.0, kind="entry", data={"entered": True}))
+    runner.shutdown()
+    # The perp close failure neither skips the spot close nor the event flush and store close
+    assert runner.closed_spot is True
+    assert runner._event_buf == []
+    assert _kinds(db) == ["entry"]
+
+
+class _BrokenCloseOutRunner(StrategyRunner):
+    def _close_out(self) -> None:
+        raise RuntimeError("bug")
+
+
+def test_runner_shutdown_persists_events_before_surfacing_a_bug(tmp_path, monkeypatch):
+    runner, db = _runner(tmp_path, monkeypatch, _BrokenCloseOutRunner)
+    runner._event_buf.append(Event(ts=1.0, kind="fee", data={"spot_fee": "0.1"}))
+    try:
+        runner.shutdown()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("programming errors are not swallowed")
+    assert _kinds(db) == ["fee"]
@@ -135,8 +135,36 @@ def test_no_entry_below_threshold():
         post_only=True,
     )
     strat = FundingCarryStrategy(spot, perp, "ASTER/USDT", "ASTER", cfg)
+    reads = []
+    info.l2_snapshot = lambda name: reads.append(name)
     result = strat.evaluate_and_place()
     assert result["entered"] is False
+    assert result["apr"] == Decimal("0.01")
     assert len(ex.placed) == 0
+    assert reads == []  # below threshold: no book reads
 
 
+def test_symbol_metas_refetched_after_ttl(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.strategy import funding_carry
+
+    clock = [1000.0]
+    monkeypatch.setattr(funding_carry, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    info = FakeInfo()
+    ex = FakeExchange()
+    fetched = []
+
+    class CountingPerp(FakePerpGateway):
+        def get_symbol_meta(self, symbol: str):
+            fetched.append(symbol)
+            return FakePerpGateway.get_symbol_meta(self, symbol)
+
+    cfg = StrategyConfig(enter_threshold_apr=Decimal("0.10"), exit_threshold_apr=Decimal("0.04"), target_usd_notional=Decimal("200"))
+    strat = FundingCarryStrategy(FakeSpotGateway("0xabc", info, ex), CountingPerp("0xabc", info, ex), "ASTER/USDT", "ASTER", cfg)
+    first = strat._metas()
+    clock[0] += funding_carry._META_TTL_S
+    assert strat._metas() == first and fetched == ["ASTER"]  # still within the TTL: cached
+    clock[0] += 1.0
+    strat._metas()
+    assert fetched == ["ASTER", "ASTER"]  # past the TTL: the tick is re-read